@@ -0,0 +1,151 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+from bank import (
+    Bank,
+    TX_DEPOSIT,
+    TX_WITHDRAW,
+    TX_TRANSFER,
+    OP_OK,
+    error_for_code,
+)
+
+
+@dataclass
+class AsyncBankMetrics:
+    operations: int = 0
+    errors: int = 0
+    batches: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    started_at: float = 0.0
+
+    @property
+    def mean_batch_size(self):
+        return self.operations / self.batches if self.batches else 0.0
+
+    @property
+    def mean_latency(self):
+        return self.total_latency / self.operations if self.operations else 0.0
+
+    @property
+    def throughput(self):
+        elapsed = time.perf_counter() - self.started_at
+        return self.operations / elapsed if self.started_at and elapsed > 0 else 0.0
+
+
+class AsyncBank:
+    """
+    asyncio front-end for a Bank.
+
+    Operations are queued and a single worker task drains everything that
+    is waiting into one ``Bank.apply_batch`` call, then resolves each
+    caller's future. The queue is bounded: once ``max_queue`` operations
+    are pending, callers wait in ``put`` (back-pressure).
+
+        async with AsyncBank(bank) as front:
+            await front.deposit(account_id, 100)
+    """
+
+    def __init__(self, bank=None, max_queue=10_000, max_batch=1_000):
+        self.bank = bank if bank is not None else Bank()
+        self.max_batch = max_batch
+        self.metrics = AsyncBankMetrics()
+        self._queue = asyncio.Queue(maxsize=max_queue)
+        self._worker = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def start(self):
+        if self._worker is None:
+            self.metrics.started_at = time.perf_counter()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        """Wait for queued operations to be applied, then stop the worker."""
+        if self._worker is None:
+            return
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def deposit(self, account_id, amount):
+        await self._submit((TX_DEPOSIT, account_id, None, amount))
+
+    async def withdraw(self, account_id, amount):
+        await self._submit((TX_WITHDRAW, account_id, None, amount))
+
+    async def transfer(self, from_id, to_id, amount):
+        await self._submit((TX_TRANSFER, from_id, to_id, amount))
+
+    async def _submit(self, op):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((op, future, time.perf_counter()))
+        await future
+
+    async def _run(self):
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                self._dequeued(batch)
+                results = self.bank.apply_batch([op for op, _, _ in batch])
+            except Exception as e:
+                # keep serving: fail this batch's callers, not the worker
+                self._fail(batch, e)
+            else:
+                self._resolve(batch, results)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _dequeued(self, batch):
+        # Called with each batch before it is applied; Instrumentation
+        # replaces it per instance to record queue wait
+        pass
+
+    def _resolve(self, batch, results):
+        metrics = self.metrics
+        now = time.perf_counter()
+        metrics.batches += 1
+        metrics.operations += len(batch)
+
+        for (_, future, enqueued_at), code in zip(batch, results):
+            latency = now - enqueued_at
+            metrics.total_latency += latency
+            if latency > metrics.max_latency:
+                metrics.max_latency = latency
+
+            if code != OP_OK:
+                metrics.errors += 1
+            if future.cancelled():
+                continue
+            if code == OP_OK:
+                future.set_result(None)
+            else:
+                future.set_exception(error_for_code(code))
+
+    def _fail(self, batch, error):
+        metrics = self.metrics
+        metrics.batches += 1
+        metrics.operations += len(batch)
+        metrics.errors += len(batch)
+        for _, future, _ in batch:
+            if not future.cancelled():
+                future.set_exception(error)
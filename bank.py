@@ -1,5 +1,11 @@
+import heapq
+import operator
+import time
+from bisect import bisect_left, bisect_right
 from abc import ABC, abstractmethod
-from datetime import datetime
+from array import array
+from datetime import datetime, timedelta
+from itertools import compress
 
 # =====================
 # Constants
@@ -13,6 +19,34 @@ ACCOUNT_SAVINGS = "savings"
 TX_DEPOSIT = "deposit"
 TX_WITHDRAW = "withdraw"
 TX_TRANSFER = "transfer"
+TX_INTEREST = "interest"
+
+# Transaction type codes used by the journal (index in TX_TYPES)
+TX_TYPES = (TX_DEPOSIT, TX_WITHDRAW, TX_TRANSFER, TX_INTEREST)
+TX_CODES = {tx_type: code for code, tx_type in enumerate(TX_TYPES)}
+
+# Types accepted by Bank.apply_batch, by name or by code
+_BATCH_TX_TYPES = (TX_DEPOSIT, TX_WITHDRAW, TX_TRANSFER)
+_TX_LOOKUP = {
+    **{tx_type: tx_type for tx_type in _BATCH_TX_TYPES},
+    **{TX_CODES[tx_type]: tx_type for tx_type in _BATCH_TX_TYPES},
+}
+
+# Codes of postings that take money out of their source account
+_DEBIT_CODES = (TX_CODES[TX_WITHDRAW], TX_CODES[TX_TRANSFER])
+_INTEREST_CODES = (TX_CODES[TX_INTEREST],)
+
+# Journal placeholder for "no target account"
+NO_ACCOUNT = -1
+
+# Batch posting result codes
+OP_OK = 0
+OP_INVALID_AMOUNT = 1
+OP_INSUFFICIENT_FUNDS = 2
+OP_WITHDRAWAL_LIMIT = 3
+OP_ACCOUNT_NOT_FOUND = 4
+OP_SAME_ACCOUNT = 5
+OP_INVALID_TYPE = 6
 
 # =====================
 # Exceptions
@@ -39,57 +73,135 @@ class AccountNotFoundError(BankError):
     pass
 
 
+ERROR_CODES = {
+    InvalidAmountError: OP_INVALID_AMOUNT,
+    InsufficientFundsError: OP_INSUFFICIENT_FUNDS,
+    WithdrawalLimitError: OP_WITHDRAWAL_LIMIT,
+    AccountNotFoundError: OP_ACCOUNT_NOT_FOUND,
+}
+
+_CODE_ERRORS = {
+    OP_INVALID_AMOUNT: (InvalidAmountError, "Amount must be positive"),
+    OP_INSUFFICIENT_FUNDS: (InsufficientFundsError, "Insufficient funds"),
+    OP_WITHDRAWAL_LIMIT: (WithdrawalLimitError, "Withdrawal limit exceeded"),
+    OP_ACCOUNT_NOT_FOUND: (AccountNotFoundError, "Account not found"),
+    OP_SAME_ACCOUNT: (ValueError, "Cannot transfer to the same account"),
+    OP_INVALID_TYPE: (ValueError, "Invalid transaction type"),
+}
+
+
+def error_for_code(code):
+    """Exception matching an OP_* result code, or None for OP_OK."""
+    if code == OP_OK:
+        return None
+    error_class, message = _CODE_ERRORS[code]
+    return error_class(message)
+
+
+def check_amount(check, amount):
+    """``check(amount)``, reporting a non-numeric amount (e.g. None or '5') as invalid."""
+    try:
+        return check(amount)
+    except TypeError:
+        return InvalidAmountError("Amount must be a number")
+
+
+# =====================
+# Money
+# =====================
+
+def format_amount(amount, minor_units=None):
+    """
+    Render an amount with two decimals, or, for integer amounts in
+    ``minor_units`` per major unit (e.g. 100 cents), exactly.
+    """
+    if minor_units is None:
+        return f"{amount:.2f}"
+    whole, fraction = divmod(abs(amount), minor_units)
+    sign = "-" if amount < 0 else ""
+    decimals = len(str(minor_units)) - 1
+    return f"{sign}{whole}.{fraction:0{decimals}d}" if decimals else f"{sign}{whole}"
+
+
 # =====================
 # Accounts
 # =====================
 
 class Account(ABC):
+    __slots__ = ("account_id", "owner", "_balance", "minor_units", "version")
+
     def __init__(self, account_id, owner):
         self.account_id = account_id
         self.owner = owner
         self._balance = 0.0
+        # Set by a fixed-point Bank: balance and amounts are then integers
+        # in 1/minor_units of the currency (e.g. cents for 100)
+        self.minor_units = None
+        # Bumped on every change committed by an OptimisticBank
+        self.version = 0
 
     @property
     def balance(self):
         return self._balance
 
-    def deposit(self, amount):
+    def check_deposit(self, amount):
+        """Return the error a deposit of ``amount`` would raise, or None."""
         if amount <= 0:
-            raise InvalidAmountError("Deposit amount must be positive")
+            return InvalidAmountError("Deposit amount must be positive")
+        if self.minor_units is not None and not isinstance(amount, int):
+            return InvalidAmountError("Amount must be a whole number of minor units")
+        return None
+
+    def deposit(self, amount):
+        error = self.check_deposit(amount)
+        if error is not None:
+            raise error
         self._balance += amount
 
     @abstractmethod
-    def withdraw(self, amount):
+    def check_withdraw(self, amount):
+        """Return the error a withdrawal of ``amount`` would raise, or None."""
         pass
 
+    def withdraw(self, amount):
+        error = self.check_withdraw(amount)
+        if error is not None:
+            raise error
+        self._balance -= amount
+
     @abstractmethod
     def __str__(self):
         pass
 
 
 class SavingsAccount(Account):
-    def __init__(self, account_id, owner, capitalization_period, annual_interest_rate, withdrawal_limit):
+    __slots__ = ("capitalization_periods_per_year", "annual_interest_rate", "withdrawal_limit", "last_capitalized_at")
+
+    def __init__(self, account_id, owner, capitalization_period, annual_interest_rate, withdrawal_limit,
+                 last_capitalized_at=None):
         super().__init__(account_id, owner)
         self.capitalization_periods_per_year = capitalization_period
         self.annual_interest_rate = annual_interest_rate
         self.withdrawal_limit = withdrawal_limit
+        self.last_capitalized_at = last_capitalized_at if last_capitalized_at is not None else datetime.now()
 
-    def withdraw(self, amount):
+    def check_withdraw(self, amount):
         if amount <= 0:
-            raise InvalidAmountError("Withdrawal amount must be positive")
+            return InvalidAmountError("Withdrawal amount must be positive")
+        if self.minor_units is not None and not isinstance(amount, int):
+            return InvalidAmountError("Amount must be a whole number of minor units")
         if amount > self.withdrawal_limit:
-            raise WithdrawalLimitError("Withdrawal limit exceeded")
+            return WithdrawalLimitError("Withdrawal limit exceeded")
         if amount > self.balance:
-            raise InsufficientFundsError("Insufficient funds")
-
-        self._balance -= amount
+            return InsufficientFundsError("Insufficient funds")
+        return None
 
     def __str__(self):
         return (
             "=== Savings Account ===\n"
             f"ID: {self.account_id}\n"
             f"Owner: {self.owner}\n"
-            f"Balance: {self.balance:.2f}\n"
+            f"Balance: {format_amount(self.balance, self.minor_units)}\n"
             f"Capitalization periods per year: {self.capitalization_periods_per_year}\n"
             f"Annual interest rate: {self.annual_interest_rate}\n"
             f"Withdrawal limit: {self.withdrawal_limit}"
@@ -97,107 +209,562 @@ class SavingsAccount(Account):
 
 
 class CheckingAccount(Account):
+    __slots__ = ("withdrawal_limit", "overdraft_limit")
+
     def __init__(self, account_id, owner, withdrawal_limit, overdraft_limit):
         super().__init__(account_id, owner)
         self.withdrawal_limit = withdrawal_limit
         self.overdraft_limit = overdraft_limit
 
-    def withdraw(self, amount):
+    def check_withdraw(self, amount):
         if amount <= 0:
-            raise InvalidAmountError("Withdrawal amount must be positive")
+            return InvalidAmountError("Withdrawal amount must be positive")
+        if self.minor_units is not None and not isinstance(amount, int):
+            return InvalidAmountError("Amount must be a whole number of minor units")
         if amount > self.withdrawal_limit:
-            raise WithdrawalLimitError("Withdrawal limit exceeded")
+            return WithdrawalLimitError("Withdrawal limit exceeded")
         if self.balance - amount < self.overdraft_limit:
-            raise InsufficientFundsError("Overdraft limit exceeded")
-
-        self._balance -= amount
+            return InsufficientFundsError("Overdraft limit exceeded")
+        return None
 
     def __str__(self):
         return (
             "=== Checking Account ===\n"
             f"ID: {self.account_id}\n"
             f"Owner: {self.owner}\n"
-            f"Balance: {self.balance:.2f}\n"
+            f"Balance: {format_amount(self.balance, self.minor_units)}\n"
             f"Withdrawal limit: {self.withdrawal_limit}\n"
             f"Overdraft limit: {self.overdraft_limit}"
         )
 
 
+# =====================
+# Columnar account store
+# =====================
+
+# AccountStore kind codes
+KIND_NONE = -1
+KIND_CHECKING = 0
+KIND_SAVINGS = 1
+
+
+class AccountStore:
+    """
+    Struct-of-arrays storage for account state.
+
+    Balances, limits and rates live in typed arrays indexed by account_id
+    (which Bank allocates densely); accounts of a bank using the store are
+    thin views over one row. Whole-book questions are answered by C-level
+    passes over the arrays instead of Python loops over account objects.
+    """
+
+    def __init__(self, minor_units=None):
+        money = "d" if minor_units is None else "q"
+        self.kinds = array("b")
+        self.balances = array(money)
+        self.withdrawal_limits = array(money)
+        self.overdraft_limits = array(money)
+        self.periods_per_year = array("q")
+        self.interest_rates = array("d")
+
+    def allocate(self, account_id, kind):
+        missing = account_id + 1 - len(self.kinds)
+        if missing > 0:
+            self.kinds.extend(array("b", [KIND_NONE]) * missing)
+            for column in (self.balances, self.withdrawal_limits, self.overdraft_limits,
+                           self.periods_per_year, self.interest_rates):
+                column.extend(array(column.typecode, [0]) * missing)
+        self.kinds[account_id] = kind
+
+    def adopt(self, account):
+        """Return a store-backed view with the state of a plain ``account``."""
+        if isinstance(account, SavingsAccount):
+            view = StoredSavingsAccount(
+                self,
+                account.account_id,
+                account.owner,
+                account.capitalization_periods_per_year,
+                account.annual_interest_rate,
+                account.withdrawal_limit,
+                account.last_capitalized_at,
+            )
+        else:
+            view = StoredCheckingAccount(
+                self,
+                account.account_id,
+                account.owner,
+                account.withdrawal_limit,
+                account.overdraft_limit,
+            )
+        view.minor_units = account.minor_units
+        view._balance = account._balance
+        return view
+
+    def _money(self, value):
+        # int.__gt__(float) is NotImplemented (truthy): compare like with like
+        return float(value) if self.balances.typecode == "d" else value
+
+    def _ids(self, kind=None):
+        if kind is None:
+            return compress(range(len(self.kinds)), map(KIND_NONE.__ne__, self.kinds))
+        return compress(range(len(self.kinds)), map(kind.__eq__, self.kinds))
+
+    def count(self, kind=None):
+        return sum(1 for _ in self._ids(kind))
+
+    def total_balance(self, kind=None):
+        """Sum of balances, optionally of one account kind only."""
+        if kind is None:
+            return sum(self.balances)
+        return sum(compress(self.balances, map(kind.__eq__, self.kinds)))
+
+    def ids_below(self, threshold, kind=None):
+        """Ids of accounts whose balance is below ``threshold``."""
+        below = map(self._money(threshold).__gt__, self.balances)
+        wanted = map(KIND_NONE.__ne__ if kind is None else kind.__eq__, self.kinds)
+        return list(compress(range(len(self.kinds)), map(operator.and_, below, wanted)))
+
+    def ids_near_overdraft(self, margin=0):
+        """Ids of checking accounts within ``margin`` of their overdraft limit."""
+        headroom = map(operator.sub, self.balances, self.overdraft_limits)
+        near = map(self._money(margin).__ge__, headroom)
+        checking = map(KIND_CHECKING.__eq__, self.kinds)
+        return list(compress(range(len(self.kinds)), map(operator.and_, near, checking)))
+
+    def top_balances(self, n, kind=None):
+        """The ``n`` largest ``(account_id, balance)`` pairs, largest first."""
+        balances = self.balances
+        top = heapq.nlargest(n, self._ids(kind), key=balances.__getitem__)
+        return [(account_id, balances[account_id]) for account_id in top]
+
+
+def _stored(column):
+    def get(self):
+        return getattr(self._store, column)[self.account_id]
+
+    def set(self, value):
+        values = getattr(self._store, column)
+        if values.typecode == "q" and isinstance(value, float) and value.is_integer():
+            value = int(value)  # e.g. the 0.0 opening balance Account.__init__ sets
+        values[self.account_id] = value
+
+    return property(get, set)
+
+
+class StoredCheckingAccount(CheckingAccount):
+    """CheckingAccount whose balance and limits live in an AccountStore."""
+    __slots__ = ("_store",)
+
+    _balance = _stored("balances")
+    withdrawal_limit = _stored("withdrawal_limits")
+    overdraft_limit = _stored("overdraft_limits")
+
+    def __init__(self, store, account_id, owner, withdrawal_limit, overdraft_limit):
+        self._store = store
+        store.allocate(account_id, KIND_CHECKING)
+        super().__init__(account_id, owner, withdrawal_limit, overdraft_limit)
+
+
+class StoredSavingsAccount(SavingsAccount):
+    """SavingsAccount whose balance, limit and rate live in an AccountStore."""
+    __slots__ = ("_store",)
+
+    _balance = _stored("balances")
+    withdrawal_limit = _stored("withdrawal_limits")
+    capitalization_periods_per_year = _stored("periods_per_year")
+    annual_interest_rate = _stored("interest_rates")
+
+    def __init__(self, store, account_id, owner, capitalization_period, annual_interest_rate, withdrawal_limit,
+                 last_capitalized_at=None):
+        self._store = store
+        store.allocate(account_id, KIND_SAVINGS)
+        super().__init__(account_id, owner, capitalization_period, annual_interest_rate, withdrawal_limit,
+                         last_capitalized_at)
+
+
 # =====================
 # Transaction
 # =====================
 
 class Transaction:
-    def __init__(self, tx_type, amount, source_account_id, target_account_id=None):
+    __slots__ = ("tx_type", "amount", "source_account_id", "target_account_id", "timestamp", "minor_units")
+
+    def __init__(self, tx_type, amount, source_account_id, target_account_id=None, timestamp=None,
+                 minor_units=None):
         self.tx_type = tx_type
         self.amount = amount
         self.source_account_id = source_account_id
         self.target_account_id = target_account_id
-        self.timestamp = datetime.now()
+        self.timestamp = timestamp if timestamp is not None else datetime.now()
+        self.minor_units = minor_units
 
     def __str__(self):
         target = f" -> {self.target_account_id}" if self.target_account_id is not None else ""
         return (
             f"[{self.timestamp:%Y-%m-%d %H:%M:%S}] "
-            f"{self.tx_type.upper()} | {self.amount:.2f} | "
+            f"{self.tx_type.upper()} | {format_amount(self.amount, self.minor_units)} | "
             f"{self.source_account_id}{target}"
         )
 
 
+def datetime_to_ns(moment):
+    return int(moment.replace(microsecond=0).timestamp()) * 1_000_000_000 + moment.microsecond * 1_000
+
+
+def ns_to_datetime(timestamp_ns):
+    seconds, remainder = divmod(timestamp_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=remainder // 1_000)
+
+
+# =====================
+# Transaction journal
+# =====================
+
+class TransactionJournal:
+    """
+    Append-only, column-oriented transaction log.
+
+    Every posting is stored as one slot in parallel typed arrays
+    (type code, amount, source id, target id, epoch-nanosecond timestamp).
+    Transaction objects are only built when entries are read back.
+
+    Timestamps are kept non-decreasing so time-range queries can bisect:
+    a posting stamped earlier than its predecessor (e.g. after a wall-clock
+    jump backwards) is clamped to the previous timestamp and counted in
+    ``clock_regressions``.
+
+    With ``minor_units`` set, amounts are stored as exact int64 minor units.
+
+    Every ``balance_checkpoint_interval``-th posting of an account also
+    stores the account's running balance, so ``balance_after`` needs a
+    bisect plus a replay of at most that many postings.
+    """
+
+    balance_checkpoint_interval = 64
+
+    def __init__(self, minor_units=None):
+        self.minor_units = minor_units
+        self._tx_types = array("b")
+        self._amounts = array("d" if minor_units is None else "q")
+        self._sources = array("q")
+        self._targets = array("q")
+        self._timestamps = array("q")
+        # account id -> journal positions where it is source or target
+        self._by_account = {}
+        # account id -> current running balance / sparse balance checkpoints;
+        # None after load_columns until rebuilt
+        self._running = {}
+        self._checkpoints = {}
+        self.clock_regressions = 0
+
+    def _index(self, account_id, position, delta):
+        positions = self._by_account.get(account_id)
+        if positions is None:
+            positions = self._by_account[account_id] = array("q")
+        positions.append(position)
+
+        running = self._running
+        if running is not None:
+            balance = running[account_id] = running.get(account_id, 0) + delta
+            if len(positions) % self.balance_checkpoint_interval == 0:
+                checkpoints = self._checkpoints.get(account_id)
+                if checkpoints is None:
+                    checkpoints = self._checkpoints[account_id] = array(self._amounts.typecode)
+                checkpoints.append(balance)
+
+    def record(self, tx_type, amount, source_account_id, target_account_id=None, timestamp_ns=None):
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        position = len(self._timestamps)
+        if position and timestamp_ns < self._timestamps[-1]:
+            self.clock_regressions += 1
+            timestamp_ns = self._timestamps[-1]
+        code = TX_CODES[tx_type]
+        self._tx_types.append(code)
+        self._amounts.append(amount)
+        self._sources.append(source_account_id)
+        self._targets.append(NO_ACCOUNT if target_account_id is None else target_account_id)
+        self._timestamps.append(timestamp_ns)
+
+        self._index(source_account_id, position, -amount if code in _DEBIT_CODES else amount)
+        if target_account_id is not None:
+            self._index(target_account_id, position, amount)
+
+    def append(self, transaction):
+        self.record(
+            transaction.tx_type,
+            transaction.amount,
+            transaction.source_account_id,
+            transaction.target_account_id,
+            datetime_to_ns(transaction.timestamp),
+        )
+
+    def _materialize(self, index):
+        target = self._targets[index]
+        return Transaction(
+            TX_TYPES[self._tx_types[index]],
+            self._amounts[index],
+            self._sources[index],
+            None if target == NO_ACCOUNT else target,
+            ns_to_datetime(self._timestamps[index]),
+            self.minor_units,
+        )
+
+    def columns(self):
+        """The journal's column arrays: type codes, amounts, sources, targets, timestamps."""
+        return self._tx_types, self._amounts, self._sources, self._targets, self._timestamps
+
+    def index_items(self):
+        """``(account_id, positions)`` pairs of the per-account index."""
+        return self._by_account.items()
+
+    def load_columns(self, columns, index):
+        """
+        Bulk-load an empty journal from column arrays (as returned by
+        ``columns()``) and a prebuilt ``{account_id: positions}`` index.
+        """
+        if len(self):
+            raise ValueError("Journal is not empty")
+        self._tx_types, self._amounts, self._sources, self._targets, self._timestamps = columns
+        self._by_account = index
+        # running balances are rebuilt on first use
+        self._running = None
+
+    def iter_rows(self, start=0, stop=None):
+        """Raw ``(type code, amount, source, target, timestamp_ns)`` rows; target is NO_ACCOUNT if unset."""
+        return zip(
+            self._tx_types[start:stop],
+            self._amounts[start:stop],
+            self._sources[start:stop],
+            self._targets[start:stop],
+            self._timestamps[start:stop],
+        )
+
+    def positions_for(self, account_id):
+        """Journal positions of all postings touching ``account_id``, in order."""
+        return self._by_account.get(account_id, array("q"))
+
+    def position_range(self, since=None, until=None):
+        """Journal positions ``[start, stop)`` with ``since <= timestamp < until``."""
+        start = bisect_left(self._timestamps, datetime_to_ns(since)) if since is not None else 0
+        stop = bisect_left(self._timestamps, datetime_to_ns(until)) if until is not None else len(self)
+        return start, max(start, stop)
+
+    def account_position_range(self, account_id, since=None, until=None):
+        """
+        ``(positions, start, stop)``: the journal positions of postings
+        touching ``account_id`` and the slice ``positions[start:stop]`` of
+        those with ``since <= timestamp < until``, found by bisection.
+        """
+        positions = self.positions_for(account_id)
+        if since is None and until is None:
+            return positions, 0, len(positions)
+        # positions are ascending and timestamps non-decreasing
+        first, last = self.position_range(since, until)
+        return positions, bisect_left(positions, first), bisect_left(positions, last)
+
+    def between(self, since=None, until=None):
+        """Transactions with ``since <= timestamp < until``, oldest first."""
+        return [self._materialize(position) for position in range(*self.position_range(since, until))]
+
+    def for_account(self, account_id, since=None, until=None):
+        """Transactions touching ``account_id`` with ``since <= timestamp < until``."""
+        positions, start, stop = self.account_position_range(account_id, since, until)
+        return [self._materialize(positions[i]) for i in range(start, stop)]
+
+    def _delta(self, account_id, position):
+        amount = self._amounts[position]
+        if self._sources[position] == account_id and self._tx_types[position] in _DEBIT_CODES:
+            return -amount
+        return amount
+
+    def _rebuild_balances(self):
+        interval = self.balance_checkpoint_interval
+        running, all_checkpoints = {}, {}
+        for account_id, positions in self._by_account.items():
+            balance = 0
+            checkpoints = array(self._amounts.typecode)
+            for count, position in enumerate(positions, 1):
+                balance += self._delta(account_id, position)
+                if count % interval == 0:
+                    checkpoints.append(balance)
+            running[account_id] = balance
+            if checkpoints:
+                all_checkpoints[account_id] = checkpoints
+        self._running, self._checkpoints = running, all_checkpoints
+
+    def balance_after(self, account_id, moment):
+        """
+        Balance of ``account_id`` implied by its postings stamped at or
+        before ``moment`` (a datetime), starting from zero.
+        """
+        if self._running is None:
+            self._rebuild_balances()
+        positions = self.positions_for(account_id)
+        count = bisect_left(positions, bisect_right(self._timestamps, datetime_to_ns(moment)))
+        interval = self.balance_checkpoint_interval
+        done = count // interval
+        balance = self._checkpoints[account_id][done - 1] if done else 0
+        for i in range(done * interval, count):
+            balance += self._delta(account_id, positions[i])
+        return balance
+
+    def rewind(self, account_id, balance, moments, keep_codes=()):
+        """
+        Balances of ``account_id`` as of each of the ascending ``moments``
+        (datetimes), obtained from its current ``balance`` by undoing its
+        later postings, newest first. Postings whose type code is in
+        ``keep_codes`` are not undone. Cost is proportional to the postings
+        stamped after ``moments[0]``.
+        """
+        positions = self.positions_for(account_id)
+        timestamps = self._timestamps
+        tx_types = self._tx_types
+        balances = [balance] * len(moments)
+        i = len(positions) - 1
+        for k in range(len(moments) - 1, -1, -1):
+            moment_ns = datetime_to_ns(moments[k])
+            while i >= 0 and timestamps[positions[i]] > moment_ns:
+                if tx_types[positions[i]] not in keep_codes:
+                    balance -= self._delta(account_id, positions[i])
+                i -= 1
+            balances[k] = balance
+        return balances
+
+    def __len__(self):
+        return len(self._timestamps)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("journal index out of range")
+        return self._materialize(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._materialize(index)
+
+
 # =====================
 # Bank Service
 # =====================
 
 class Bank:
-    def __init__(self):
+    journal_class = TransactionJournal
+
+    def __init__(self, minor_units=None, columnar_accounts=False, idempotency_cache=None):
+        """
+        ``minor_units`` switches the bank to fixed-point money: balances,
+        limits and amounts are integers counting 1/minor_units of the
+        currency (100 for cents), and every posting is exact integer
+        arithmetic. It must be a power of ten.
+
+        ``columnar_accounts`` keeps account state in an AccountStore
+        (``self.account_store``) for vectorized whole-book queries.
+
+        ``idempotency_cache`` (an idempotency.IdempotencyCache) enables the
+        ``idempotency_key`` argument of deposit, withdraw and transfer.
+        """
+        if minor_units is not None and (
+            not isinstance(minor_units, int) or minor_units < 1 or str(minor_units).rstrip("0") != "1"
+        ):
+            raise ValueError("minor_units must be a power of ten")
+        self.minor_units = minor_units
         self._counter = 0
         self.accounts = {}
-        self.transactions = []
+        self.transactions = self.journal_class(minor_units)
+        self.account_store = AccountStore(minor_units) if columnar_accounts else None
+        self.idempotency_cache = idempotency_cache
 
     def _get_account(self, account_id):
         if account_id not in self.accounts:
             raise AccountNotFoundError("Account not found")
         return self.accounts[account_id]
 
-    def create_account(self, account_type, owner, **kwargs):
+    def _register(self, account):
+        # Insert a freshly built account, keeping ids unique; returns the
+        # registered object (a store-backed view with columnar accounts)
+        if self.minor_units is not None:
+            account.minor_units = self.minor_units
+            account._balance = 0
+        if self.account_store is not None:
+            account = self.account_store.adopt(account)
+        self.accounts[account.account_id] = account
+        self._counter = max(self._counter, account.account_id + 1)
+        return account
+
+    def _build_account(self, account_id, account_type, owner, kwargs):
         if account_type == ACCOUNT_CHECKING:
             account = CheckingAccount(
-                self._counter,
+                account_id,
                 owner,
                 kwargs["withdrawal_limit"],
                 kwargs["overdraft_limit"],
             )
+            limits = (account.withdrawal_limit, account.overdraft_limit)
         elif account_type == ACCOUNT_SAVINGS:
             # expect key 'capitalization_period' to match SavingsAccount init
             account = SavingsAccount(
-                self._counter,
+                account_id,
                 owner,
                 kwargs["capitalization_periods_per_year"],
                 kwargs["annual_interest_rate"],
                 kwargs["withdrawal_limit"],
+                kwargs.get("last_capitalized_at"),
             )
+            limits = (account.withdrawal_limit,)
         else:
             raise ValueError("Invalid account type")
-
-        self.accounts[self._counter] = account
-        self._counter += 1
+        if self.minor_units is not None and not all(isinstance(limit, int) for limit in limits):
+            raise ValueError("Limits must be whole numbers of minor units")
         return account
 
-    def deposit(self, account_id, amount):
+    def create_account(self, account_type, owner, **kwargs):
+        return self._register(self._build_account(self._counter, account_type, owner, kwargs))
+
+    def create_accounts(self, specs):
+        """
+        Create accounts from ``(account_type, owner, kwargs)`` specs, as
+        create_account would, with one block of consecutive ids.
+
+        Every spec is built before any is registered, so an invalid spec
+        leaves the bank unchanged. Returns the new accounts in spec order.
+        """
+        built = [
+            self._build_account(account_id, account_type, owner, kwargs)
+            for account_id, (account_type, owner, kwargs) in enumerate(specs, self._counter)
+        ]
+        return [self._register(account) for account in built]
+
+    def _idempotent(self, key, request, operation, *args):
+        """Run ``operation(*args)`` at most once per idempotency ``key``."""
+        if self.idempotency_cache is None:
+            raise ValueError("Bank has no idempotency cache")
+        return self.idempotency_cache.run(key, request, lambda: operation(*args))
+
+    def deposit(self, account_id, amount, idempotency_key=None):
+        if idempotency_key is not None:
+            request = (TX_DEPOSIT, account_id, amount)
+            return self._idempotent(idempotency_key, request, Bank.deposit, self, account_id, amount)
         account = self._get_account(account_id)
         account.deposit(amount)
-        self.transactions.append(
-            Transaction(TX_DEPOSIT, amount, account_id)
-        )
+        self.transactions.record(TX_DEPOSIT, amount, account_id)
 
-    def withdraw(self, account_id, amount):
+    def withdraw(self, account_id, amount, idempotency_key=None):
+        if idempotency_key is not None:
+            request = (TX_WITHDRAW, account_id, amount)
+            return self._idempotent(idempotency_key, request, Bank.withdraw, self, account_id, amount)
         account = self._get_account(account_id)
         account.withdraw(amount)
-        self.transactions.append(
-            Transaction(TX_WITHDRAW, amount, account_id)
-        )
+        self.transactions.record(TX_WITHDRAW, amount, account_id)
 
-    def transfer(self, from_id, to_id, amount):
+    def transfer(self, from_id, to_id, amount, idempotency_key=None):
+        if idempotency_key is not None:
+            request = (TX_TRANSFER, from_id, to_id, amount)
+            return self._idempotent(idempotency_key, request, Bank.transfer, self, from_id, to_id, amount)
         if from_id == to_id:
             raise ValueError("Cannot transfer to the same account")
         source = self._get_account(from_id)
@@ -206,6 +773,157 @@ class Bank:
         source.withdraw(amount)
         target.deposit(amount)
 
-        self.transactions.append(
-            Transaction(TX_TRANSFER, amount, from_id, to_id)
-        )
\ No newline at end of file
+        self.transactions.record(TX_TRANSFER, amount, from_id, to_id)
+
+    def transactions_for(self, account_id, since=None, until=None):
+        """
+        History of one account (as source or target), oldest first.
+
+        Optional ``since``/``until`` datetimes bound the timestamps
+        (inclusive/exclusive). Cost is proportional to the account's activity.
+        """
+        self._get_account(account_id)
+        return self.transactions.for_account(account_id, since, until)
+
+    def transactions_between(self, since=None, until=None):
+        """All postings with ``since <= timestamp < until``, in O(log n + k)."""
+        return self.transactions.between(since, until)
+
+    def balance_at(self, account_id, moment):
+        """
+        Balance of an account as of ``moment`` (a datetime): postings
+        stamped at or before it are included. Uses the journal's sparse
+        balance checkpoints, so cost does not grow with the history.
+        """
+        self._get_account(account_id)
+        return self.transactions.balance_after(account_id, moment)
+
+    def recent_transactions(self, window):
+        """Postings from the last ``window`` (a timedelta), e.g. ``timedelta(minutes=5)``."""
+        return self.transactions.between(since=datetime.now() - window)
+
+    def apply_batch(self, ops, timestamp_ns=None):
+        """
+        Post a sequence of ``(tx_type, source_id, target_id, amount)`` operations.
+
+        ``tx_type`` is a transaction type name or its TX_CODES value and
+        ``target_id`` is only used by transfers. Operations are applied in
+        order and never raise: the returned array holds one OP_* result code
+        per operation. Malformed rows are classified too: a row without
+        four fields or with an unknown or unhashable type is OP_INVALID_TYPE, an unknown or unhashable id
+        OP_ACCOUNT_NOT_FOUND and a non-numeric amount OP_INVALID_AMOUNT.
+        All postings of a batch share one timestamp: ``timestamp_ns`` if
+        given (raised to the journal's last timestamp if behind it), else now.
+        """
+        accounts = self.accounts
+        record = self.transactions.record
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        results = array("b")
+
+        for op in ops:
+            try:
+                op_type, source_id, target_id, amount = op
+                tx_type = _TX_LOOKUP.get(op_type)
+            except (TypeError, ValueError):  # not a 4-field row, or an unhashable type
+                tx_type = None
+            if tx_type is None:
+                results.append(OP_INVALID_TYPE)
+                continue
+            try:
+                source = accounts.get(source_id)
+            except TypeError:
+                source = None
+            if source is None:
+                results.append(OP_ACCOUNT_NOT_FOUND)
+                continue
+
+            if tx_type == TX_DEPOSIT:
+                target_id = None
+                error = check_amount(source.check_deposit, amount)
+                if error is None:
+                    source._balance += amount
+            elif tx_type == TX_WITHDRAW:
+                target_id = None
+                error = check_amount(source.check_withdraw, amount)
+                if error is None:
+                    source._balance -= amount
+            else:
+                if target_id == source_id:
+                    results.append(OP_SAME_ACCOUNT)
+                    continue
+                try:
+                    target = accounts.get(target_id)
+                except TypeError:
+                    target = None
+                if target is None:
+                    results.append(OP_ACCOUNT_NOT_FOUND)
+                    continue
+                error = check_amount(source.check_withdraw, amount)
+                if error is None:
+                    source._balance -= amount
+                    target._balance += amount
+
+            if error is not None:
+                results.append(ERROR_CODES[type(error)])
+                continue
+            record(tx_type, amount, source_id, target_id, timestamp_ns)
+            results.append(OP_OK)
+
+        return results
+
+    def capitalize_interest(self, as_of=None, posted_at=None):
+        """
+        Credit interest due on every SavingsAccount up to ``as_of`` (default: now).
+
+        Interest compounds once per capitalization period
+        (365 / capitalization_periods_per_year days) completed since the
+        account was last capitalized. Each period earns on the balance at
+        its start, read back from the journal, plus the interest of the
+        earlier periods of the same run: money deposited during a period
+        starts earning in the next one. Postings are TX_INTEREST entries
+        sharing one timestamp, ``posted_at`` (default: now); in fixed-point
+        mode interest is rounded to the nearest minor unit. Returns the
+        number of accounts credited.
+        """
+        if as_of is None:
+            as_of = datetime.now()
+
+        groups = {}
+        for account in self.accounts.values():
+            if isinstance(account, SavingsAccount):
+                key = (account.capitalization_periods_per_year, account.annual_interest_rate)
+                groups.setdefault(key, []).append(account)
+
+        journal = self.transactions
+        record = journal.record
+        timestamp_ns = datetime_to_ns(posted_at) if posted_at is not None else time.time_ns()
+        minor_units = self.minor_units
+        credited = 0
+
+        for (periods_per_year, annual_interest_rate), accounts in groups.items():
+            period = timedelta(days=365 / periods_per_year)
+            rate = annual_interest_rate / periods_per_year / 100
+
+            for account in accounts:
+                elapsed = (as_of - account.last_capitalized_at) // period
+                if elapsed <= 0:
+                    continue
+                starts = [account.last_capitalized_at + period * k for k in range(elapsed)]
+                account.last_capitalized_at += period * elapsed
+
+                # earlier interest postings stay: they belong to periods
+                # before the first start, whenever they were stamped
+                interest = 0
+                for opening in journal.rewind(account.account_id, account._balance, starts, _INTEREST_CODES):
+                    interest += (opening + interest) * rate
+                if minor_units is not None:
+                    interest = round(interest)
+                if interest <= 0:
+                    continue
+
+                account._balance += interest
+                record(TX_INTEREST, interest, account.account_id, None, timestamp_ns)
+                credited += 1
+
+        return credited
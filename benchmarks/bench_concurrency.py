@@ -0,0 +1,91 @@
+"""
+Stress benchmark for ConcurrentBank.
+
+Runs random transfers between accounts from 1, 2, 4, ... threads and
+reports throughput per thread count. Scaling beyond one core is only
+expected on free-threaded (no-GIL) interpreter builds.
+
+    python benchmarks/bench_concurrency.py --accounts 10000 --ops 200000
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bank import ACCOUNT_CHECKING, BankError  # noqa: E402
+from concurrent_bank import ConcurrentBank  # noqa: E402
+
+
+def _build_bank(accounts, opening_balance):
+    bank = ConcurrentBank()
+    for i in range(accounts):
+        account = bank.create_account(
+            ACCOUNT_CHECKING,
+            f"owner-{i}",
+            withdrawal_limit=opening_balance,
+            overdraft_limit=0,
+        )
+        bank.deposit(account.account_id, opening_balance)
+    return bank
+
+
+def _worker(bank, accounts, ops, seed, barrier):
+    rng = random.Random(seed)
+    barrier.wait()
+    for _ in range(ops):
+        from_id = rng.randrange(accounts)
+        to_id = rng.randrange(accounts)
+        if from_id == to_id:
+            continue
+        try:
+            bank.transfer(from_id, to_id, rng.randint(1, 10))
+        except BankError:
+            pass
+
+
+def run(threads, accounts, total_ops, opening_balance=1_000):
+    bank = _build_bank(accounts, opening_balance)
+    barrier = threading.Barrier(threads + 1)
+    per_thread = total_ops // threads
+    workers = [
+        threading.Thread(target=_worker, args=(bank, accounts, per_thread, seed, barrier))
+        for seed in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    total = sum(account.balance for account in bank.accounts.values())
+    assert total == accounts * opening_balance, "money was created or destroyed"
+    return per_thread * threads / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=10_000)
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--max-threads", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+
+    baseline = None
+    threads = 1
+    while threads <= args.max_threads:
+        rate = run(threads, args.accounts, args.ops)
+        baseline = baseline or rate
+        print(f"{threads:>3} threads: {rate:>12,.0f} transfers/s  (x{rate / baseline:.2f})")
+        threads *= 2
+
+
+if __name__ == "__main__":
+    main()
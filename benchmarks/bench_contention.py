@@ -0,0 +1,95 @@
+"""
+Contention benchmark: pessimistic (ConcurrentBank) vs optimistic
+(OptimisticBank) transfers.
+
+A fraction of transfers comes from a few hot "payroll" accounts, the rest
+moves money between random accounts. Reports transfers per second for
+both modes, and conflicts (retries) for the optimistic one, at 1, 2, 4,
+... threads. Differences beyond one core need a free-threaded build.
+
+    python benchmarks/bench_contention.py --ops 200000 --hot-ratio 0.8
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bank import ACCOUNT_CHECKING, BankError  # noqa: E402
+from concurrent_bank import ConcurrentBank, OptimisticBank  # noqa: E402
+
+
+def _build_bank(cls, accounts, hot, opening_balance):
+    bank = cls()
+    for i in range(accounts):
+        account = bank.create_account(
+            ACCOUNT_CHECKING,
+            f"owner-{i}",
+            withdrawal_limit=opening_balance,
+            overdraft_limit=-10**12 if i < hot else 0,
+        )
+        bank.deposit(account.account_id, opening_balance)
+    return bank
+
+
+def _worker(bank, accounts, hot, hot_ratio, ops, seed, barrier):
+    rng = random.Random(seed)
+    barrier.wait()
+    for _ in range(ops):
+        from_id = rng.randrange(hot) if rng.random() < hot_ratio else rng.randrange(accounts)
+        to_id = rng.randrange(hot, accounts)
+        if from_id == to_id:
+            continue
+        try:
+            bank.transfer(from_id, to_id, rng.randint(1, 10))
+        except BankError:
+            pass
+
+
+def run(cls, threads, accounts, hot, hot_ratio, total_ops, opening_balance=1_000):
+    bank = _build_bank(cls, accounts, hot, opening_balance)
+    barrier = threading.Barrier(threads + 1)
+    per_thread = total_ops // threads
+    workers = [
+        threading.Thread(target=_worker, args=(bank, accounts, hot, hot_ratio, per_thread, seed, barrier))
+        for seed in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    total = sum(account.balance for account in bank.accounts.values())
+    assert total == accounts * opening_balance, "money was created or destroyed"
+    return per_thread * threads / elapsed, getattr(bank, "conflicts", 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=10_000)
+    parser.add_argument("--hot", type=int, default=4, help="number of hot payroll accounts")
+    parser.add_argument("--hot-ratio", type=float, default=0.8, help="share of transfers from hot accounts")
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--max-threads", type=int, default=max(os.cpu_count() or 1, 4))
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    print(f"{'threads':>7}{'pessimistic/s':>16}{'optimistic/s':>16}{'conflicts':>11}")
+
+    threads = 1
+    while threads <= args.max_threads:
+        pessimistic, _ = run(ConcurrentBank, threads, args.accounts, args.hot, args.hot_ratio, args.ops)
+        optimistic, conflicts = run(OptimisticBank, threads, args.accounts, args.hot, args.hot_ratio, args.ops)
+        print(f"{threads:>7}{pessimistic:>16,.0f}{optimistic:>16,.0f}{conflicts:>11,}")
+        threads *= 2
+
+
+if __name__ == "__main__":
+    main()
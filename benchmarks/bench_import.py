@@ -0,0 +1,53 @@
+"""
+Throughput benchmark for bulk account import.
+
+Generates a CSV of checking and savings accounts with opening balances,
+then imports it with bulk_import.import_accounts and reports accounts per
+minute (the migration target is well above 1M/minute).
+
+    python benchmarks/bench_import.py --accounts 1000000
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bank import ACCOUNT_CHECKING, ACCOUNT_SAVINGS, Bank  # noqa: E402
+from bulk_import import FIELDS, import_accounts  # noqa: E402
+
+
+def _source(accounts):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(FIELDS)
+    for i in range(accounts):
+        if i % 4:
+            writer.writerow((ACCOUNT_CHECKING, f"owner-{i}", 1_000, -100, "", "", i % 500))
+        else:
+            writer.writerow((ACCOUNT_SAVINGS, f"owner-{i}", 1_000, "", 12, 3.5, 1_000))
+    out.seek(0)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=1_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    parser.add_argument("--columnar", action="store_true", help="use Bank(columnar_accounts=True)")
+    args = parser.parse_args()
+
+    source = _source(args.accounts)
+    report = import_accounts(Bank(columnar_accounts=args.columnar), source, chunk_rows=args.chunk_rows)
+
+    print(f"accounts:          {report.accounts:,}")
+    print(f"opening balances:  {report.opening_balances:,}")
+    print(f"rejected rows:     {len(report.rejected):,}")
+    print(f"seconds:           {report.seconds:.2f}")
+    print(f"accounts / minute: {report.accounts_per_minute:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Memory benchmark for accounts and transactions.
+
+Reports bytes per account and per transaction, measured with tracemalloc:
+
+- accounts: the slotted Account classes vs. copies of the classes as
+  they were before ``__slots__`` (plain ``__dict__`` instances)
+- transactions: one journal row vs. a materialized Transaction object vs.
+  the original ``__dict__``-based Transaction kept in a list (the
+  original ``Bank.transactions``)
+
+The current SavingsAccount also holds a ``last_capitalized_at`` datetime
+the original did not have; it is included in the "after" figure.
+
+    python benchmarks/bench_memory.py --count 200000
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bank import (  # noqa: E402
+    CheckingAccount,
+    SavingsAccount,
+    Transaction,
+    TransactionJournal,
+    TX_DEPOSIT,
+)
+
+
+# The account and transaction classes as they were before __slots__:
+# plain classes keeping every attribute in a per-instance __dict__
+
+class BaselineAccount:
+    def __init__(self, account_id, owner):
+        self.account_id = account_id
+        self.owner = owner
+        self._balance = 0.0
+
+
+class BaselineSavingsAccount(BaselineAccount):
+    def __init__(self, account_id, owner, capitalization_period, annual_interest_rate, withdrawal_limit):
+        super().__init__(account_id, owner)
+        self.capitalization_periods_per_year = capitalization_period
+        self.annual_interest_rate = annual_interest_rate
+        self.withdrawal_limit = withdrawal_limit
+
+
+class BaselineCheckingAccount(BaselineAccount):
+    def __init__(self, account_id, owner, withdrawal_limit, overdraft_limit):
+        super().__init__(account_id, owner)
+        self.withdrawal_limit = withdrawal_limit
+        self.overdraft_limit = overdraft_limit
+
+
+class BaselineTransaction:
+    def __init__(self, tx_type, amount, source_account_id, target_account_id=None):
+        self.tx_type = tx_type
+        self.amount = amount
+        self.source_account_id = source_account_id
+        self.target_account_id = target_account_id
+        self.timestamp = datetime.now()
+
+
+def _measure(build, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / count
+
+
+def _checking(cls):
+    return lambda count: [cls(i, "owner", 1_000, -100) for i in range(count)]
+
+
+# Each object gets its own datetime, as the constructors' datetime.now()
+# defaults give it, so the per-object timestamp is counted too
+
+def _baseline_savings(count):
+    return [BaselineSavingsAccount(i, "owner", 12, 5.0, 1_000) for i in range(count)]
+
+
+def _savings(count):
+    return [SavingsAccount(i, "owner", 12, 5.0, 1_000, datetime.now()) for i in range(count)]
+
+
+def _baseline_transactions(count):
+    return [BaselineTransaction(TX_DEPOSIT, 10.0, i) for i in range(count)]
+
+
+def _transactions(count):
+    return [Transaction(TX_DEPOSIT, 10.0, i, None, datetime.now()) for i in range(count)]
+
+
+def _journal(count):
+    journal = TransactionJournal()
+    for i in range(count):
+        journal.record(TX_DEPOSIT, 10.0, i % 1_000)
+    return journal
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+    count = args.count
+
+    rows = [
+        ("CheckingAccount", _measure(_checking(BaselineCheckingAccount), count),
+         _measure(_checking(CheckingAccount), count)),
+        ("SavingsAccount", _measure(_baseline_savings, count), _measure(_savings, count)),
+        ("Transaction object", _measure(_baseline_transactions, count), _measure(_transactions, count)),
+        ("Transaction (journal row)", _measure(_baseline_transactions, count), _measure(_journal, count)),
+    ]
+
+    print(f"{'bytes per item':<28}{'before':>10}{'after':>10}{'saved':>9}")
+    for name, before, after in rows:
+        print(f"{name:<28}{before:>10.1f}{after:>10.1f}{1 - after / before:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Throughput benchmark for the scenario engine.
+
+Projects a synthetic savings book under random rate paths with 1, 2,
+4, ... worker processes and reports account-scenarios per second.
+Scaling needs as many cores as workers.
+
+    python benchmarks/bench_scenarios.py --accounts 1000000 --scenarios 1000 --steps 120
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenarios import ScenarioEngine, random_rate_shifts  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=200_000)
+    parser.add_argument("--scenarios", type=int, default=200)
+    parser.add_argument("--steps", type=int, default=120, help="monthly steps per path")
+    parser.add_argument("--products", type=int, default=8, help="distinct (periods, rate) savings products")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    products = [(rng.choice((1, 4, 12, 365)), round(rng.uniform(0.5, 5), 2)) for _ in range(args.products)]
+    book = [rng.choice(products) for _ in range(args.accounts)]
+    capitals = [rng.uniform(0, 100_000) for _ in range(args.accounts)]
+    paths = random_rate_shifts(args.scenarios, args.steps, seed=1)
+
+    workers = 1
+    while workers <= args.max_workers:
+        engine = ScenarioEngine(capitals, [p for p, _ in book], [r for _, r in book], workers=workers)
+        started = time.perf_counter()
+        engine.book_totals(paths, days_per_step=365 / 12)
+        elapsed = time.perf_counter() - started
+        print(f"{workers:>3} workers: {args.accounts * args.scenarios / elapsed:>14,.0f} account-scenarios/s")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
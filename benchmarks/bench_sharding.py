@@ -0,0 +1,79 @@
+"""
+Scaling benchmark for ShardedBank.
+
+Posts the same batched workload (deposits, same-shard and cross-shard
+transfers) with 1, 2, 4, ... shard processes and reports throughput per
+shard count.
+
+    python benchmarks/bench_sharding.py --accounts 100000 --ops 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bank import ACCOUNT_CHECKING, TX_DEPOSIT, TX_TRANSFER  # noqa: E402
+from sharded_bank import ShardedBank  # noqa: E402
+
+
+def _workload(accounts, ops, cross_shard_ratio, shards, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(ops):
+        source = rng.randrange(accounts)
+        if rng.random() < 0.5:
+            rows.append((TX_DEPOSIT, source, None, rng.randint(1, 100)))
+            continue
+        target = rng.randrange(accounts)
+        if rng.random() >= cross_shard_ratio:
+            # move the target onto the source's shard
+            target -= (target - source) % shards
+        if target == source or target < 0:
+            continue
+        rows.append((TX_TRANSFER, source, target, rng.randint(1, 10)))
+    return rows
+
+
+def run(shards, accounts, ops, batch_size, cross_shard_ratio):
+    with ShardedBank(shards=shards) as bank:
+        opening = []
+        for i in range(accounts):
+            bank.create_account(ACCOUNT_CHECKING, f"owner-{i}", withdrawal_limit=1_000, overdraft_limit=-1_000)
+            opening.append((TX_DEPOSIT, i, None, 1_000))
+        bank.apply_batch(opening)
+
+        rows = _workload(accounts, ops, cross_shard_ratio, shards)
+        started = time.perf_counter()
+        for start in range(0, len(rows), batch_size):
+            bank.apply_batch(rows[start:start + batch_size])
+        elapsed = time.perf_counter() - started
+
+        assert sum(bank.balances().values()) == accounts * 1_000 + sum(
+            row[3] for row in rows if row[0] == TX_DEPOSIT
+        ), "balances do not reconcile"
+    return len(rows) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=20_000)
+    parser.add_argument("--ops", type=int, default=400_000)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--cross-shard-ratio", type=float, default=0.05)
+    parser.add_argument("--max-shards", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    baseline = None
+    shards = 1
+    while shards <= args.max_shards:
+        rate = run(shards, args.accounts, args.ops, args.batch_size, args.cross_shard_ratio)
+        baseline = baseline or rate
+        print(f"{shards:>3} shards: {rate:>12,.0f} ops/s  (x{rate / baseline:.2f})")
+        shards *= 2
+
+
+if __name__ == "__main__":
+    main()
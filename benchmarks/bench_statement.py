@@ -0,0 +1,47 @@
+"""
+Statement rendering benchmark.
+
+Renders the history of one busy account with ``str(Transaction)`` per
+posting (the previous way) and with statement.render_statement, and
+reports lines per second for both.
+
+    python benchmarks/bench_statement.py --lines 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bank import ACCOUNT_CHECKING, Bank, TX_DEPOSIT  # noqa: E402
+from statement import render_statement  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    bank = Bank()
+    account = bank.create_account(ACCOUNT_CHECKING, "owner", withdrawal_limit=1_000, overdraft_limit=-100)
+    bank.apply_batch([(TX_DEPOSIT, account.account_id, None, 1 + i % 100) for i in range(args.lines)])
+
+    with open(os.devnull, "w") as out:
+        started = time.perf_counter()
+        out.write(f"{account}\n")
+        for tx in bank.transactions_for(account.account_id):
+            out.write(f"{tx}\n")
+        baseline = time.perf_counter() - started
+
+        started = time.perf_counter()
+        render_statement(bank, account.account_id, out)
+        rendered = time.perf_counter() - started
+
+    print(f"{'str(tx) per line':<20}{args.lines / baseline:>14,.0f} lines/s")
+    print(f"{'render_statement':<20}{args.lines / rendered:>14,.0f} lines/s")
+    print(f"speedup: {baseline / rendered:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Throughput regression suite (pytest-benchmark).
+
+Not collected by the normal test run; run it explicitly and save the
+results as JSON:
+
+    python -m pytest benchmarks/bench_suite.py --benchmark-json=benchmarks/current.json
+
+and compare against a committed baseline, failing on regressions above a
+threshold:
+
+    python benchmarks/compare_benchmarks.py benchmarks/baseline.json benchmarks/current.json --threshold 0.10
+
+``make bench-baseline`` (run on the reference machine) writes
+benchmarks/baseline.json, ``make bench-compare`` runs the suite and
+compares against it. Account counts go up to ``BENCH_MAX_ACCOUNTS``
+(default 1M; set 10000000 for the full 10M run).
+
+Memory benchmarks report ``bytes_per_*`` in extra_info; their timings
+are not meaningful and the comparison ignores them.
+"""
+import builtins
+import os
+import random
+import runpy
+import subprocess
+import sys
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bank import ACCOUNT_CHECKING, ACCOUNT_SAVINGS, Bank, TX_DEPOSIT, TX_TRANSFER  # noqa: E402
+from finance_tools import CompoundInterestCalculator  # noqa: E402
+from snapshot import load_snapshot, write_snapshot  # noqa: E402
+
+MAX_ACCOUNTS = int(os.environ.get("BENCH_MAX_ACCOUNTS", 1_000_000))
+ACCOUNT_COUNTS = [
+    pytest.param(count, marks=pytest.mark.skipif(count > MAX_ACCOUNTS, reason="above BENCH_MAX_ACCOUNTS"))
+    for count in (1_000, 100_000, 1_000_000, 10_000_000)
+]
+OPS = 100_000
+
+
+# =========================================================
+# Helpers
+# =========================================================
+
+def _checking_bank(accounts, balance=1_000, **bank_options):
+    bank = Bank(**bank_options)
+    bank.create_accounts(
+        (ACCOUNT_CHECKING, f"owner-{i}", {"withdrawal_limit": 10**9, "overdraft_limit": -(10**9)})
+        for i in range(accounts)
+    )
+    bank.apply_batch([(TX_DEPOSIT, i, None, balance) for i in range(accounts)])
+    return bank
+
+
+def _transfers(accounts, ops, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(ops):
+        source, target = rng.randrange(accounts), rng.randrange(accounts)
+        if source != target:
+            rows.append((TX_TRANSFER, source, target, rng.randint(1, 100)))
+    return rows
+
+
+def _bytes_per_item(build, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / count
+
+
+# =========================================================
+# Postings
+# =========================================================
+
+def test_single_deposits(benchmark):
+    bank = _checking_bank(1_000)
+    deposit = bank.deposit
+
+    def run():
+        for i in range(OPS):
+            deposit(i % 1_000, 1)
+
+    benchmark.extra_info["ops"] = OPS
+    benchmark.pedantic(run, rounds=5, iterations=1)
+
+
+@pytest.mark.parametrize("batch_size", [100, 10_000])
+def test_batched_deposits(benchmark, batch_size):
+    bank = _checking_bank(1_000)
+    batches = [[(TX_DEPOSIT, (b + i) % 1_000, None, 1) for i in range(batch_size)] for b in range(OPS // batch_size)]
+
+    def run():
+        for batch in batches:
+            bank.apply_batch(batch)
+
+    benchmark.extra_info["ops"] = OPS
+    benchmark.pedantic(run, rounds=5, iterations=1)
+
+
+@pytest.mark.parametrize("accounts", ACCOUNT_COUNTS)
+def test_transfers(benchmark, accounts):
+    bank = _checking_bank(accounts)
+    rows = _transfers(accounts, OPS)
+    transfer = bank.transfer
+
+    def run():
+        for _, source, target, amount in rows:
+            transfer(source, target, amount)
+
+    benchmark.extra_info["ops"] = len(rows)
+    benchmark.pedantic(run, rounds=3, iterations=1)
+
+
+@pytest.mark.parametrize("accounts", ACCOUNT_COUNTS)
+def test_batched_transfers(benchmark, accounts):
+    bank = _checking_bank(accounts)
+    rows = _transfers(accounts, OPS)
+
+    benchmark.extra_info["ops"] = len(rows)
+    benchmark.pedantic(bank.apply_batch, args=(rows,), rounds=3, iterations=1)
+
+
+# =========================================================
+# finance_tools
+# =========================================================
+
+@pytest.mark.parametrize("size", [10_000, 1_000_000])
+def test_portfolio_interest_projection(benchmark, size):
+    rng = random.Random(0)
+    capitals = [rng.uniform(0, 100_000) for _ in range(size)]
+    periods = [rng.choice((1, 4, 12, 365)) for _ in range(size)]
+    rates = [rng.uniform(0, 10) for _ in range(size)]
+
+    benchmark.extra_info["accounts"] = size
+    benchmark(CompoundInterestCalculator.calculate_portfolio_compound_interest, capitals, 365, periods, rates)
+
+
+def test_bank_interest_projection(benchmark):
+    bank = Bank()
+    bank.create_accounts(
+        (ACCOUNT_SAVINGS, f"owner-{i}", {
+            "capitalization_periods_per_year": 12,
+            "annual_interest_rate": 1 + i % 5,
+            "withdrawal_limit": 1_000,
+        })
+        for i in range(100_000)
+    )
+    bank.apply_batch([(TX_DEPOSIT, i, None, 1_000) for i in range(100_000)])
+
+    benchmark(CompoundInterestCalculator.calculate_bank_compound_interest, bank, 365)
+
+
+# =========================================================
+# Memory
+# =========================================================
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_memory_per_account(benchmark, columnar):
+    count = 100_000
+    result = benchmark.pedantic(
+        _bytes_per_item, args=(lambda: _checking_bank(count, columnar_accounts=columnar), count), rounds=1
+    )
+    benchmark.extra_info["bytes_per_account"] = result
+
+
+def test_memory_per_transaction(benchmark):
+    bank = _checking_bank(1_000)
+    count = 100_000
+
+    def build():
+        bank.apply_batch([(TX_DEPOSIT, i % 1_000, None, 1) for i in range(count)])
+        return bank
+
+    benchmark.extra_info["bytes_per_transaction"] = benchmark.pedantic(_bytes_per_item, args=(build, count), rounds=1)
+
+
+# =========================================================
+# Cold start
+# =========================================================
+
+def test_cold_import(benchmark):
+    command = [sys.executable, "-c", "import bank, finance_tools, cli_bank"]
+    benchmark.pedantic(subprocess.run, args=(command,), kwargs={"cwd": ROOT, "check": True}, rounds=5, iterations=1)
+
+
+def test_cold_start_from_snapshot(benchmark, tmp_path):
+    path = str(tmp_path / "bank.snap")
+    bank = _checking_bank(100_000)
+    bank.apply_batch(_transfers(100_000, OPS))
+    write_snapshot(bank, path)
+
+    benchmark.pedantic(lambda: load_snapshot(path, Bank()), rounds=5, iterations=1)
+
+
+# =========================================================
+# CLI
+# =========================================================
+
+def test_cli_session(benchmark, monkeypatch, capsys):
+    session = ["1", "1", "A", "1000", "-100", "1", "1", "B", "1000", "-100"]
+    session += ["2", "0", "500"] * 200 + ["4", "0", "1", "1"] * 200 + ["5", "6", "0"]
+
+    def run():
+        inputs = iter(session)
+        monkeypatch.setattr(builtins, "input", lambda prompt="": next(inputs))
+        runpy.run_module("cli_bank", run_name="__main__")
+        capsys.readouterr()
+
+    benchmark.pedantic(run, rounds=5, iterations=1)
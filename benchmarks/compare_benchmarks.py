@@ -0,0 +1,76 @@
+"""
+Compare two pytest-benchmark JSON files and fail on regressions.
+
+A benchmark regresses when its mean time grows by more than
+``--threshold`` (a fraction, default 0.10) over the baseline; memory
+figures recorded in ``extra_info`` (keys starting with ``bytes_per``) are
+held to the same threshold. Memory benchmarks are compared on those
+figures only: their time is just the tracemalloc-traced setup. Benchmarks
+present in only one file are listed but never fail the comparison.
+
+    python benchmarks/compare_benchmarks.py benchmarks/baseline.json benchmarks/current.json --threshold 0.10
+
+or ``make bench-compare``.
+
+Exits with status 1 if anything regressed.
+"""
+import argparse
+import json
+import sys
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {bench["fullname"]: bench for bench in data["benchmarks"]}
+
+
+def _metrics(bench):
+    memory = [(key, value) for key, value in sorted(bench.get("extra_info", {}).items()) if key.startswith("bytes_per")]
+    if not memory:
+        yield "mean_s", bench["stats"]["mean"]
+    yield from memory
+
+
+def compare(baseline, current, threshold):
+    """Return ``(rows, regressions)``; rows are ``(name, metric, old, new, change)``."""
+    rows, regressions = [], []
+    for name in sorted(baseline.keys() | current.keys()):
+        if name not in current or name not in baseline:
+            rows.append((name, "missing in " + ("current" if name not in current else "baseline"), None, None, None))
+            continue
+        old_metrics = dict(_metrics(baseline[name]))
+        for metric, new in _metrics(current[name]):
+            old = old_metrics.get(metric)
+            if not old:
+                continue
+            change = new / old - 1
+            rows.append((name, metric, old, new, change))
+            if change > threshold:
+                regressions.append((name, metric, change))
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    rows, regressions = compare(_load(args.baseline), _load(args.current), args.threshold)
+    for name, metric, old, new, change in rows:
+        if change is None:
+            print(f"{name:<70} {metric}")
+        else:
+            flag = "  REGRESSION" if change > args.threshold else ""
+            print(f"{name:<70} {metric:<24}{old:>14.6g}{new:>14.6g}{change:>+9.1%}{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+    print("\nno regressions")
+
+
+if __name__ == "__main__":
+    main()
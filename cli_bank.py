@@ -1,5 +1,9 @@
+import sys
+
 from bank import ACCOUNT_CHECKING, Bank, ACCOUNT_SAVINGS, BankError
+from export import export_columnar, export_csv
 from finance_tools import CompoundInterestCalculator
+from statement import render_transactions
 
 if __name__ == "__main__":
     bank = Bank()
@@ -14,6 +18,7 @@ if __name__ == "__main__":
         print("5. Show Accounts")
         print("6. Show Transactions")
         print("7. Calculate Interest (Savings)")
+        print("8. Export Transactions")
         print("0. Exit")
 
         choice = input("Choose option: ").strip()
@@ -70,8 +75,7 @@ if __name__ == "__main__":
                     print(acc)
 
             elif choice == "6":
-                for tx in bank.transactions:
-                    print(tx)
+                render_transactions(bank.transactions, sys.stdout)
 
             elif choice == "7":
                 acc_id = int(input("Savings Account ID: "))
@@ -82,6 +86,20 @@ if __name__ == "__main__":
                 print(f"Final amount after {days} days: {amount:.2f}")
                 print(f"Interest earned: {interest:.2f}")
 
+            elif choice == "8":
+                fmt = input("Format (1=csv, 2=columnar): ").strip()
+                path = input("File path: ").strip()
+                if fmt == "1":
+                    with open(path, "w", newline="", encoding="utf-8") as f:
+                        rows = export_csv(bank, f)
+                elif fmt == "2":
+                    with open(path, "wb") as f:
+                        rows = export_columnar(bank, f)
+                else:
+                    print("Invalid format")
+                    continue
+                print(f"Exported {rows} transactions to {path}")
+
             elif choice == "0":
                 print("Goodbye!")
                 break
@@ -94,4 +112,6 @@ if __name__ == "__main__":
         except ValueError as e:
             print(f"Invalid input: {e}")
         except TypeError as e:
-            print(f"Type error: {e}")
\ No newline at end of file
+            print(f"Type error: {e}")
+        except OSError as e:
+            print(f"Error: {e}")
\ No newline at end of file
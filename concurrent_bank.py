@@ -0,0 +1,238 @@
+import threading
+import time
+from contextlib import ExitStack
+
+from bank import AccountNotFoundError, Bank, TransactionJournal, TX_DEPOSIT, TX_TRANSFER, TX_WITHDRAW
+
+
+# =====================
+# Synchronized journal
+# =====================
+
+class SynchronizedJournal(TransactionJournal):
+    """
+    TransactionJournal whose appends are serialized by one short lock.
+
+    Only the append itself is guarded; validation and balance updates
+    happen under the account locks before the posting reaches the journal.
+
+    A timestamp taken before the lock (e.g. an apply_batch stamp) can lose
+    the race to a later posting from another thread. Such a posting is
+    still clamped, but counted in ``clock_regressions`` only if the clock
+    itself is behind the journal.
+    """
+
+    def __init__(self, minor_units=None):
+        super().__init__(minor_units)
+        self._lock = threading.Lock()
+
+    def record(self, tx_type, amount, source_account_id, target_account_id=None, timestamp_ns=None):
+        with self._lock:
+            timestamps = self._timestamps
+            if (timestamp_ns is not None and timestamps and timestamp_ns < timestamps[-1]
+                    and time.time_ns() >= timestamps[-1]):
+                timestamp_ns = timestamps[-1]
+            super().record(tx_type, amount, source_account_id, target_account_id, timestamp_ns)
+
+
+# =====================
+# Concurrent Bank
+# =====================
+
+class ConcurrentBank(Bank):
+    """
+    Bank that can be shared between threads.
+
+    Every account has its own lock. Operations touching several accounts
+    acquire their locks in ascending account id order, so concurrent
+    transfers in opposite directions cannot deadlock. Account ids are
+    allocated under a registry lock.
+    """
+
+    journal_class = SynchronizedJournal
+
+    def __init__(self, minor_units=None, columnar_accounts=False, idempotency_cache=None):
+        super().__init__(minor_units, columnar_accounts, idempotency_cache)
+        self._registry_lock = threading.Lock()
+        self._account_locks = {}
+
+    def _lock_for(self, account_id):
+        lock = self._account_locks.get(account_id)
+        if lock is None:
+            raise AccountNotFoundError("Account not found")
+        return lock
+
+    def _touched(self, ops):
+        """Ids of existing accounts named by batch ``ops`` (malformed ids are left to apply_batch)."""
+        locks = self._account_locks
+        touched = set()
+        for op in ops:
+            try:
+                for account_id in op[1:3]:
+                    if account_id in locks:
+                        touched.add(account_id)
+            except TypeError:  # not a row, or an unhashable id
+                pass
+        return touched
+
+    def _locked(self, account_ids):
+        """Context manager holding the locks of all existing ``account_ids``."""
+        stack = ExitStack()
+        locks = self._account_locks
+        for account_id in sorted(set(account_ids) & locks.keys()):
+            stack.enter_context(locks[account_id])
+        return stack
+
+    def create_account(self, account_type, owner, **kwargs):
+        with self._registry_lock:
+            account = super().create_account(account_type, owner, **kwargs)
+            self._account_locks[account.account_id] = threading.Lock()
+        return account
+
+    def create_accounts(self, specs):
+        with self._registry_lock:
+            accounts = super().create_accounts(specs)
+            for account in accounts:
+                self._account_locks[account.account_id] = threading.Lock()
+        return accounts
+
+    def deposit(self, account_id, amount, idempotency_key=None):
+        with self._lock_for(account_id):
+            super().deposit(account_id, amount, idempotency_key)
+
+    def withdraw(self, account_id, amount, idempotency_key=None):
+        with self._lock_for(account_id):
+            super().withdraw(account_id, amount, idempotency_key)
+
+    def transfer(self, from_id, to_id, amount, idempotency_key=None):
+        if from_id == to_id:
+            raise ValueError("Cannot transfer to the same account")
+        locks = {from_id: self._lock_for(from_id), to_id: self._lock_for(to_id)}
+        first, second = sorted(locks)
+        with locks[first], locks[second]:
+            super().transfer(from_id, to_id, amount, idempotency_key)
+
+    def apply_batch(self, ops, timestamp_ns=None):
+        # Lock every account the batch touches up front, then run the
+        # single-threaded loop without per-operation locking.
+        ops = list(ops)
+        with self._locked(self._touched(ops)):
+            return super().apply_batch(ops, timestamp_ns)
+
+    def capitalize_interest(self, as_of=None, posted_at=None):
+        with self._registry_lock, self._locked(list(self._account_locks)):
+            return super().capitalize_interest(as_of, posted_at)
+
+
+# =====================
+# Optimistic Bank
+# =====================
+
+class OptimisticBank(ConcurrentBank):
+    """
+    ConcurrentBank whose postings validate without holding any lock and
+    commit with compare-and-swap semantics.
+
+    An operation reads the versions of the accounts involved, checks the
+    withdrawal rules, then try-acquires the account locks (it never waits
+    on them) and commits only if no version changed in between; otherwise
+    it retries. Threads hammering one hot account retry briefly instead of
+    queuing behind its lock. ``conflicts`` counts retries.
+    """
+
+    def __init__(self, minor_units=None, columnar_accounts=False, idempotency_cache=None):
+        super().__init__(minor_units, columnar_accounts, idempotency_cache)
+        self.conflicts = 0
+
+    def _commit(self, accounts, versions, apply):
+        """Run ``apply`` if ``accounts`` still have ``versions``; False on conflict."""
+        locks = self._account_locks
+        acquired = []
+        try:
+            for account in sorted(accounts, key=lambda a: a.account_id):
+                lock = locks[account.account_id]
+                if not lock.acquire(blocking=False):
+                    break
+                acquired.append(lock)
+            else:
+                if all(account.version == version for account, version in zip(accounts, versions)):
+                    apply()
+                    for account in accounts:
+                        account.version += 1
+                    return True
+        finally:
+            for lock in acquired:
+                lock.release()
+        self.conflicts += 1
+        time.sleep(0)  # let the committer that beat us finish
+        return False
+
+    def _post(self, accounts, check, apply):
+        while True:
+            versions = [account.version for account in accounts]
+            error = check()
+            if error is not None:
+                if all(account.version == version for account, version in zip(accounts, versions)):
+                    raise error
+                continue  # validated against a balance that moved; re-check
+            if self._commit(accounts, versions, apply):
+                return
+
+    def deposit(self, account_id, amount, idempotency_key=None):
+        if idempotency_key is not None:
+            request = (TX_DEPOSIT, account_id, amount)
+            return self._idempotent(idempotency_key, request, OptimisticBank.deposit, self, account_id, amount)
+        account = self._get_account(account_id)
+
+        def apply():
+            account._balance += amount
+            self.transactions.record(TX_DEPOSIT, amount, account_id)
+
+        self._post((account,), lambda: account.check_deposit(amount), apply)
+
+    def withdraw(self, account_id, amount, idempotency_key=None):
+        if idempotency_key is not None:
+            request = (TX_WITHDRAW, account_id, amount)
+            return self._idempotent(idempotency_key, request, OptimisticBank.withdraw, self, account_id, amount)
+        account = self._get_account(account_id)
+
+        def apply():
+            account._balance -= amount
+            self.transactions.record(TX_WITHDRAW, amount, account_id)
+
+        self._post((account,), lambda: account.check_withdraw(amount), apply)
+
+    def transfer(self, from_id, to_id, amount, idempotency_key=None):
+        if idempotency_key is not None:
+            request = (TX_TRANSFER, from_id, to_id, amount)
+            return self._idempotent(idempotency_key, request, OptimisticBank.transfer, self, from_id, to_id, amount)
+        if from_id == to_id:
+            raise ValueError("Cannot transfer to the same account")
+        source = self._get_account(from_id)
+        target = self._get_account(to_id)
+
+        def apply():
+            source._balance -= amount
+            target._balance += amount
+            self.transactions.record(TX_TRANSFER, amount, from_id, to_id)
+
+        self._post((source, target), lambda: source.check_withdraw(amount), apply)
+
+    # Bulk operations keep the blocking account locks, then bump versions so
+    # optimistic operations validated before them retry.
+
+    def apply_batch(self, ops, timestamp_ns=None):
+        ops = list(ops)
+        touched = self._touched(ops)
+        with self._locked(touched):
+            results = Bank.apply_batch(self, ops, timestamp_ns)
+            for account_id in touched:
+                self.accounts[account_id].version += 1
+        return results
+
+    def capitalize_interest(self, as_of=None, posted_at=None):
+        with self._registry_lock, self._locked(list(self._account_locks)):
+            credited = Bank.capitalize_interest(self, as_of, posted_at)
+            for account in self.accounts.values():
+                account.version += 1
+        return credited
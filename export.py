@@ -0,0 +1,133 @@
+import csv
+import struct
+from array import array
+
+from bank import NO_ACCOUNT, TX_TYPES, format_amount, ns_to_datetime
+from snapshot import ARRAY_BLOCK, _write_array
+
+# =====================
+# Columnar file layout
+# =====================
+#
+#   header
+#   row groups, each: row count, then the 5 journal columns as array blocks
+#   end marker (row count -1)
+#
+# Array blocks use the snapshot framing (typecode, byte length, raw bytes),
+# so a reader can map each column straight back into an array.
+
+MAGIC = b"BANKCOLS"
+VERSION = 1
+
+# magic, version, minor units (0: float money)
+HEADER = struct.Struct("<8sIq")
+ROW_GROUP = struct.Struct("<q")
+END_OF_FILE = -1
+
+CSV_FIELDS = ("timestamp", "type", "amount", "source_account_id", "target_account_id")
+
+DEFAULT_CHUNK_ROWS = 65_536
+
+
+# =====================
+# Row selection
+# =====================
+
+def _chunks(journal, since, until, account_id, chunk_rows):
+    """
+    Yield the selected journal rows as column chunks of at most
+    ``chunk_rows`` rows, so memory stays bounded by the chunk size.
+    """
+    columns = journal.columns()
+    if account_id is None:
+        start, stop = journal.position_range(since, until)
+        for first in range(start, stop, chunk_rows):
+            last = min(first + chunk_rows, stop)
+            yield tuple(column[first:last] for column in columns)
+        return
+
+    positions, low, high = journal.account_position_range(account_id, since, until)
+    for first in range(low, high, chunk_rows):
+        selected = positions[first:min(first + chunk_rows, high)]
+        yield tuple(array(column.typecode, map(column.__getitem__, selected)) for column in columns)
+
+
+# =====================
+# Exporters
+# =====================
+
+def export_csv(bank, out, since=None, until=None, account_id=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Stream ``bank``'s transactions to the text file ``out`` as CSV.
+
+    Rows are read from the journal columns a chunk at a time; no
+    Transaction objects are built. ``since``/``until`` bound timestamps
+    (``since <= timestamp < until``) and ``account_id`` keeps postings
+    touching one account. Amounts are written losslessly: shortest
+    round-trip floats, or exact decimals for fixed-point banks.
+    Returns the number of rows written.
+    """
+    minor_units = bank.transactions.minor_units
+    if minor_units is None:
+        amount_text = repr
+    else:
+        def amount_text(amount):
+            return format_amount(amount, minor_units)
+
+    writer = csv.writer(out)
+    writer.writerow(CSV_FIELDS)
+    rows = 0
+    for tx_types, amounts, sources, targets, timestamps in _chunks(
+        bank.transactions, since, until, account_id, chunk_rows
+    ):
+        writer.writerows(zip(
+            (ns_to_datetime(ns).isoformat() for ns in timestamps),
+            map(TX_TYPES.__getitem__, tx_types),
+            map(amount_text, amounts),
+            sources,
+            ("" if target == NO_ACCOUNT else target for target in targets),
+        ))
+        rows += len(timestamps)
+    return rows
+
+
+def export_columnar(bank, out, since=None, until=None, account_id=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Stream ``bank``'s transactions to the binary file ``out`` in row groups
+    of raw column arrays (a Parquet-like layout without compression).
+
+    Filters as in export_csv. Each row group is written with
+    ``array.tofile``, so export runs at roughly disk speed.
+    Returns the number of rows written.
+    """
+    out.write(HEADER.pack(MAGIC, VERSION, bank.transactions.minor_units or 0))
+    rows = 0
+    for chunk in _chunks(bank.transactions, since, until, account_id, chunk_rows):
+        out.write(ROW_GROUP.pack(len(chunk[0])))
+        for column in chunk:
+            _write_array(out, column)
+        rows += len(chunk[0])
+    out.write(ROW_GROUP.pack(END_OF_FILE))
+    return rows
+
+
+def read_columnar(path):
+    """
+    Yield the row groups of a file written by export_columnar as tuples of
+    arrays: type codes, amounts, sources, targets, timestamps.
+    """
+    with open(path, "rb") as f:
+        magic, version, _ = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a columnar transaction export")
+        while True:
+            (count,) = ROW_GROUP.unpack(f.read(ROW_GROUP.size))
+            if count == END_OF_FILE:
+                return
+            group = []
+            for _ in range(5):
+                typecode, size = ARRAY_BLOCK.unpack(f.read(ARRAY_BLOCK.size))
+                column = array(typecode.decode("ascii"))
+                column.frombytes(f.read(size))
+                group.append(column)
+            yield tuple(group)
@@ -1,5 +1,44 @@
+import math
+import operator
+from array import array
+from collections import namedtuple
+from datetime import date, timedelta
+from functools import lru_cache
+
 from bank import SavingsAccount
 
+# Distinct (days, periods per year, rate) growth factors kept by growth_factor
+GROWTH_FACTOR_CACHE_SIZE = 4_096
+
+# One day of an accrual schedule: balance after ``day`` days, interest
+# accrued that day and since the start
+AccrualRow = namedtuple("AccrualRow", "day date account_id balance interest accrued")
+
+
+def _as_column(values, typecode, error):
+    # Conversion to a typed array type-checks every element in C
+    try:
+        if isinstance(values, (int, float)):
+            return array(typecode, (values,))
+        return array(typecode, values)
+    except TypeError:
+        raise ValueError(error) from None
+
+
+@lru_cache(maxsize=GROWTH_FACTOR_CACHE_SIZE)
+def growth_factor(days, capitalization_periods_per_year, annual_interest_rate):
+    """
+    Factor a capital grows by over ``days`` (inputs already validated).
+
+    Evaluated in log space, ``exp(n * log1p(r))``, which stays accurate for
+    small per-period rates over long horizons where ``(1 + r) ** n`` loses
+    digits to rounding of ``1 + r``. Savings products share a handful of
+    (periods, rate) pairs, so factors are memoized with LRU eviction.
+    """
+    periods = (days / 365) * capitalization_periods_per_year
+    rate_per_period = annual_interest_rate / capitalization_periods_per_year / 100
+    return math.exp(periods * math.log1p(rate_per_period))
+
 
 class CompoundInterestCalculator:
     @staticmethod
@@ -22,18 +61,126 @@ class CompoundInterestCalculator:
         if annual_interest_rate < 0:
             raise ValueError("annual_interest_rate must be non-negative")
 
-        periods = (days / 365) * capitalization_periods_per_year
-        rate_per_period = annual_interest_rate / capitalization_periods_per_year / 100
-        final_amount = starting_capital * (1 + rate_per_period) ** periods
-        return final_amount
+        return starting_capital * growth_factor(days, capitalization_periods_per_year, annual_interest_rate)
 
     @staticmethod
     def calculate_savings_account_compound_interest(account: SavingsAccount, days: int) -> float:
         if not isinstance(account, SavingsAccount):
             raise TypeError("Account must be a SavingsAccount")
-        return CompoundInterestCalculator.calculate_compound_interest(
+        final_amount = CompoundInterestCalculator.calculate_compound_interest(
             starting_capital=account.balance,
             days=days,
             capitalization_periods_per_year=account.capitalization_periods_per_year,
             annual_interest_rate=account.annual_interest_rate
         )
+        # Fixed-point accounts stay in whole minor units
+        if account.minor_units is not None:
+            return round(final_amount)
+        return final_amount
+
+    @staticmethod
+    def calculate_portfolio_compound_interest(starting_capitals, days, capitalization_periods_per_year, annual_interest_rates,
+                                              as_minor_units=False):
+        """
+        Vectorized calculate_compound_interest over parallel sequences.
+
+        Each argument is either a sequence (one value per account) or a
+        scalar shared by all accounts. Inputs are validated once per column.
+        Returns an ``array('d')`` of final amounts, or with ``as_minor_units``
+        an ``array('q')`` rounded to whole minor units.
+        """
+        # Walidacja wejścia
+        columns = [
+            _as_column(starting_capitals, "d", "starting_capital must be a number"),
+            _as_column(days, "q", "days must be an integer"),
+            _as_column(capitalization_periods_per_year, "q", "capitalization_periods_per_year must be an integer"),
+            _as_column(annual_interest_rates, "d", "annual_interest_rate must be a number"),
+        ]
+        size = max(len(column) for column in columns)
+        for index, column in enumerate(columns):
+            if len(column) == 1:
+                columns[index] = column * size
+            elif len(column) != size:
+                raise ValueError("All inputs must have the same length")
+        capitals, days, periods_per_year, rates = columns
+        typecode = "q" if as_minor_units else "d"
+        if not size:
+            return array(typecode)
+
+        if min(capitals) < 0:
+            raise ValueError("starting_capital must be non-negative")
+        if min(days) < 0:
+            raise ValueError("days must be non-negative")
+        if min(periods_per_year) <= 0:
+            raise ValueError("capitalization_periods_per_year must be positive")
+        if min(rates) < 0:
+            raise ValueError("annual_interest_rate must be non-negative")
+
+        # one cached factor lookup and one multiplication per account
+        final_amounts = map(operator.mul, capitals, map(growth_factor, days, periods_per_year, rates))
+        if as_minor_units:
+            final_amounts = map(round, final_amounts)
+        return array(typecode, final_amounts)
+
+    @staticmethod
+    def calculate_bank_compound_interest(bank, days: int):
+        """
+        Project every SavingsAccount of ``bank`` over ``days``.
+
+        Returns ``(account_ids, final_amounts)`` as parallel arrays.
+        """
+        accounts = [account for account in bank.accounts.values() if isinstance(account, SavingsAccount)]
+        account_ids = array("q", [account.account_id for account in accounts])
+        final_amounts = CompoundInterestCalculator.calculate_portfolio_compound_interest(
+            [account.balance for account in accounts],
+            days,
+            [account.capitalization_periods_per_year for account in accounts],
+            [account.annual_interest_rate for account in accounts],
+            as_minor_units=bank.minor_units is not None,
+        )
+        return account_ids, final_amounts
+
+    @staticmethod
+    def accrual_schedule(accounts, days: int, start: date = None):
+        """
+        Stream day-by-day accrual rows for one SavingsAccount or many.
+
+        Yields an AccrualRow per account for each day 1..``days`` (dated
+        from ``start``, default today), day by day. Balances advance by
+        one multiplication with each product's daily growth factor, so
+        the schedule costs O(days x accounts) multiplications and memory
+        proportional to the number of accounts only. Every 365 days the
+        balances are re-anchored on the exact growth factor so rounding
+        does not accumulate over multi-year horizons. Day ``days`` matches
+        calculate_savings_account_compound_interest (before rounding to
+        minor units).
+        """
+        if isinstance(accounts, SavingsAccount):
+            accounts = [accounts]
+        accounts = list(accounts)
+        if not all(isinstance(account, SavingsAccount) for account in accounts):
+            raise TypeError("Account must be a SavingsAccount")
+        if not isinstance(days, int):
+            raise ValueError("days must be an integer")
+        if days < 0:
+            raise ValueError("days must be non-negative")
+        start = start if start is not None else date.today()
+
+        account_ids = [account.account_id for account in accounts]
+        capitals = [account.balance for account in accounts]
+        products = [(account.capitalization_periods_per_year, account.annual_interest_rate) for account in accounts]
+        daily_factors = [growth_factor(1, periods, rate) for periods, rate in products]
+
+        balances = capitals
+        for day in range(1, days + 1):
+            previous = balances
+            if day % 365:
+                balances = list(map(operator.mul, previous, daily_factors))
+            else:
+                balances = [
+                    capital * growth_factor(day, periods, rate)
+                    for capital, (periods, rate) in zip(capitals, products)
+                ]
+            moment = start + timedelta(days=day)
+            for account_id, capital, before, balance in zip(account_ids, capitals, previous, balances):
+                yield AccrualRow(day, moment, account_id, balance, balance - before, balance - capital)
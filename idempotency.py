@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from bank import BankError
+
+
+@dataclass
+class IdempotencyMetrics:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _Entry:
+    __slots__ = ("request", "expires_at", "pending", "waiters", "result", "error")
+
+    def __init__(self, request, expires_at):
+        self.request = request
+        self.expires_at = expires_at
+        self.pending = True
+        # threading.Event, created only if a duplicate arrives mid-flight
+        self.waiters = None
+        self.result = None
+        self.error = None
+
+
+class IdempotencyCache:
+    """
+    Bounded in-process cache of operation outcomes by idempotency key.
+
+    The first call with a key runs the operation and remembers its outcome
+    (its return value, or the BankError it raised); later calls with the
+    same key return or re-raise that outcome without running anything. A
+    duplicate arriving while the original is still running waits for it.
+    Reusing a key for a different request raises ValueError.
+
+    At most ``max_entries`` keys are kept, least recently used evicted
+    first; with ``ttl_seconds`` set, keys also expire that long after
+    their first use. Keys whose operation is still running are never
+    evicted or expired, since a retry would run it again: the cache may
+    briefly hold more than ``max_entries`` keys.
+    """
+
+    def __init__(self, max_entries=100_000, ttl_seconds=None, clock=time.monotonic):
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.metrics = IdempotencyMetrics()
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _claim(self, key, request):
+        """Return ``(entry, is_new)`` for ``key``, creating the entry on a miss."""
+        now = self._clock()
+        entries = self._entries
+        metrics = self.metrics
+        with self._lock:
+            entry = entries.get(key)
+            if (entry is not None and not entry.pending
+                    and entry.expires_at is not None and entry.expires_at <= now):
+                del entries[key]
+                metrics.expirations += 1
+                entry = None
+            if entry is not None:
+                metrics.hits += 1
+                entries.move_to_end(key)
+                if entry.pending and entry.waiters is None:
+                    entry.waiters = threading.Event()
+                return entry, False
+
+            metrics.misses += 1
+            expires_at = now + self.ttl_seconds if self.ttl_seconds is not None else None
+            entry = entries[key] = _Entry(request, expires_at)
+            excess = len(entries) - self.max_entries
+            if excess > 0:
+                self._evict(excess)
+            return entry, True
+
+    def _evict(self, count):
+        # Oldest settled entries first; only in-flight entries are skipped.
+        victims = []
+        for key, entry in self._entries.items():
+            if len(victims) == count:
+                break
+            if not entry.pending:
+                victims.append(key)
+        for key in victims:
+            del self._entries[key]
+        self.metrics.evictions += len(victims)
+
+    def _settle(self, key, entry, keep):
+        with self._lock:
+            entry.pending = False
+            if not keep and self._entries.get(key) is entry:
+                # not a business outcome: let a retry run the operation again
+                del self._entries[key]
+            if entry.waiters is not None:
+                entry.waiters.set()
+
+    def run(self, key, request, operation):
+        """
+        Run ``operation()`` once per ``key`` and return its outcome.
+
+        ``request`` identifies what the key was used for (e.g. the
+        operation name and arguments) and must match on duplicates.
+        """
+        entry, is_new = self._claim(key, request)
+        if entry.request != request:
+            raise ValueError("Idempotency key was already used for a different request")
+
+        if is_new:
+            keep = True
+            try:
+                entry.result = operation()
+            except BankError as e:
+                entry.error = e
+            except BaseException as e:
+                entry.error = e
+                keep = False
+            finally:
+                self._settle(key, entry, keep)
+        elif entry.pending:
+            entry.waiters.wait()
+
+        if entry.error is not None:
+            raise entry.error
+        return entry.result
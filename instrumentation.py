@@ -0,0 +1,298 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from bank import (
+    OP_INVALID_AMOUNT,
+    OP_INSUFFICIENT_FUNDS,
+    OP_WITHDRAWAL_LIMIT,
+    OP_ACCOUNT_NOT_FOUND,
+    OP_SAME_ACCOUNT,
+    OP_INVALID_TYPE,
+    error_for_code,
+)
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implied
+DEFAULT_BUCKETS = (
+    1e-6, 2.5e-6, 5e-6,
+    1e-5, 2.5e-5, 5e-5,
+    1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3,
+    1e-2, 2.5e-2, 5e-2,
+    0.1, 0.25, 0.5, 1.0,
+)
+
+# Bank methods timed by Instrumentation.attach
+OPERATIONS = (
+    "create_account",
+    "create_accounts",
+    "deposit",
+    "withdraw",
+    "transfer",
+    "apply_batch",
+    "capitalize_interest",
+)
+
+# apply_batch result code -> error class name
+_ERROR_LABELS = {
+    code: type(error_for_code(code)).__name__
+    for code in (
+        OP_INVALID_AMOUNT,
+        OP_INSUFFICIENT_FUNDS,
+        OP_WITHDRAWAL_LIMIT,
+        OP_ACCOUNT_NOT_FOUND,
+        OP_SAME_ACCOUNT,
+        OP_INVALID_TYPE,
+    )
+}
+
+
+# =====================
+# Histogram
+# =====================
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus style."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        # one slot per bucket plus the +Inf overflow
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(zip(self.buckets + (float("inf"),), self.counts)),
+        }
+
+
+# =====================
+# Timed locks
+# =====================
+
+class _TimedLock:
+    """Wraps an account lock, recording how long acquiring it waited."""
+    __slots__ = ("_lock", "_record")
+
+    def __init__(self, lock, record):
+        self._lock = lock
+        self._record = record
+
+    def acquire(self, blocking=True, timeout=-1):
+        started = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        self._record(time.perf_counter() - started)
+        return acquired
+
+    def release(self):
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._lock.release()
+
+
+# =====================
+# Instrumentation
+# =====================
+
+class Instrumentation:
+    """
+    Opt-in latency and error metrics for a Bank.
+
+    ``attach(bank)`` shadows the bank's operations (OPERATIONS) with timed
+    wrappers on that instance only, so banks that are not attached run the
+    plain class methods at no cost. It records per operation:
+
+    - a latency histogram,
+    - error counts by exception class (for apply_batch, by result code),
+
+    plus, for a ConcurrentBank, the time spent waiting for account locks,
+    and, for an AsyncBank (``attach_async``), the time operations sat in
+    the queue before their batch was applied.
+
+    ``snapshot()`` returns everything as a dict; ``write_prometheus(path)``
+    dumps it in the Prometheus text exposition format.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.latency = {}
+        self.errors = {}
+        self.lock_wait = Histogram(self.buckets)
+        self.queue_wait = Histogram(self.buckets)
+        self._lock = threading.Lock()
+
+    def _histogram(self, operation):
+        histogram = self.latency.get(operation)
+        if histogram is None:
+            histogram = self.latency.setdefault(operation, Histogram(self.buckets))
+        return histogram
+
+    def _count_error(self, operation, error_name, count=1):
+        key = (operation, error_name)
+        self.errors[key] = self.errors.get(key, 0) + count
+
+    # ---- wrappers
+
+    def _timed(self, operation, method):
+        histogram = self._histogram(operation)
+        lock = self._lock
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            except Exception as e:
+                with lock:
+                    self._count_error(operation, type(e).__name__)
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                with lock:
+                    histogram.observe(elapsed)
+
+        timed.__wrapped__ = method
+        return timed
+
+    def _timed_batch(self, method):
+        timed = self._timed("apply_batch", method)
+
+        def apply_batch(ops, *args, **kwargs):
+            results = timed(ops, *args, **kwargs)
+            with self._lock:
+                for code, label in _ERROR_LABELS.items():
+                    count = results.count(code)
+                    if count:
+                        self._count_error("apply_batch", label, count)
+            return results
+
+        apply_batch.__wrapped__ = method
+        return apply_batch
+
+    def _record_lock_wait(self, seconds):
+        with self._lock:
+            self.lock_wait.observe(seconds)
+
+    def _time_locks(self, bank, account_ids):
+        locks = bank._account_locks
+        for account_id in account_ids:
+            lock = locks[account_id]
+            if not isinstance(lock, _TimedLock):
+                locks[account_id] = _TimedLock(lock, self._record_lock_wait)
+
+    def attach(self, bank):
+        """Start recording metrics for ``bank``; returns ``bank``."""
+        for operation in OPERATIONS:
+            method = getattr(bank, operation, None)
+            if method is None:
+                continue
+            if operation == "apply_batch":
+                wrapped = self._timed_batch(method)
+            else:
+                wrapped = self._timed(operation, method)
+            setattr(bank, operation, wrapped)
+
+        if hasattr(bank, "_account_locks"):
+            self._time_locks(bank, list(bank._account_locks))
+            # locks of accounts created later are wrapped as they appear
+            for operation in ("create_account", "create_accounts"):
+                created = getattr(bank, operation)
+
+                def create(*args, _create=created, **kwargs):
+                    result = _create(*args, **kwargs)
+                    accounts = result if isinstance(result, list) else (result,)
+                    self._time_locks(bank, [account.account_id for account in accounts])
+                    return result
+
+                create.__wrapped__ = created.__wrapped__
+                setattr(bank, operation, create)
+        return bank
+
+    @staticmethod
+    def detach(bank):
+        """Stop recording metrics for ``bank``."""
+        for operation in OPERATIONS:
+            bank.__dict__.pop(operation, None)
+        locks = getattr(bank, "_account_locks", None)
+        if locks is not None:
+            for account_id, lock in list(locks.items()):
+                if isinstance(lock, _TimedLock):
+                    locks[account_id] = lock._lock
+
+    def attach_async(self, front):
+        """Record queue wait of an AsyncBank and attach its underlying bank."""
+        self.attach(front.bank)
+
+        def dequeued(batch):
+            now = time.perf_counter()
+            with self._lock:
+                for _, _, enqueued_at in batch:
+                    self.queue_wait.observe(now - enqueued_at)
+
+        front._dequeued = dequeued
+        return front
+
+    # ---- export
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "latency": {operation: h.snapshot() for operation, h in self.latency.items() if h.count},
+                "errors": {f"{operation}:{error}": count for (operation, error), count in self.errors.items()},
+                "lock_wait": self.lock_wait.snapshot(),
+                "queue_wait": self.queue_wait.snapshot(),
+            }
+
+    def prometheus_text(self):
+        lines = []
+
+        def histogram(name, help_text, series):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, h in series:
+                cumulative = 0
+                for bound, count in zip(h.buckets + (float("inf"),), h.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{name}_bucket{{{labels}le="{le}"}} {cumulative}')
+                bare = "{" + labels.rstrip(",") + "}" if labels else ""
+                lines.append(f"{name}_sum{bare} {h.sum!r}")
+                lines.append(f"{name}_count{bare} {h.count}")
+
+        with self._lock:
+            histogram(
+                "bank_operation_duration_seconds",
+                "Latency of Bank operations.",
+                [(f'operation="{operation}",', h) for operation, h in sorted(self.latency.items()) if h.count],
+            )
+            lines.append("# HELP bank_operation_errors_total Failed Bank operations by error class.")
+            lines.append("# TYPE bank_operation_errors_total counter")
+            for (operation, error), count in sorted(self.errors.items()):
+                lines.append(f'bank_operation_errors_total{{operation="{operation}",error="{error}"}} {count}')
+            histogram("bank_lock_wait_seconds", "Time spent waiting for account locks.", [("", self.lock_wait)])
+            histogram("bank_queue_wait_seconds", "Time operations waited in the AsyncBank queue.",
+                      [("", self.queue_wait)])
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Write ``prometheus_text()`` to ``path`` atomically (for a node-exporter textfile collector)."""
+        temporary = path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(temporary, path)
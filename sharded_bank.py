@@ -0,0 +1,314 @@
+import itertools
+import multiprocessing
+import os
+from array import array
+
+from bank import (
+    AccountNotFoundError,
+    Bank,
+    TX_TRANSFER,
+    TX_CODES,
+    ERROR_CODES,
+    OP_OK,
+    OP_ACCOUNT_NOT_FOUND,
+    OP_INVALID_TYPE,
+    check_amount,
+    error_for_code,
+)
+
+_TRANSFER_TYPES = (TX_TRANSFER, TX_CODES[TX_TRANSFER])
+
+
+# =====================
+# Shard worker
+# =====================
+
+class ShardBank(Bank):
+    """
+    Bank holding one shard of a ShardedBank.
+
+    Account ids are global: shard ``s`` of ``n`` allocates ``s, s + n,
+    s + 2n, ...``, so ``account_id % n`` is the owning shard. Cross-shard
+    transfers are applied in two phases through prepare_* and finish.
+    """
+
+    def __init__(self, shard, shards, minor_units=None):
+        super().__init__(minor_units)
+        self._counter = shard
+        self._stride = shards
+        # transfer id -> (is_debit, account_id, counterparty_id, amount)
+        self._pending = {}
+
+    def create_account(self, account_type, owner, **kwargs):
+        account = super().create_account(account_type, owner, **kwargs)
+        self._counter += self._stride - 1
+        return account
+
+    def create_accounts(self, specs):
+        # ids are strided, not one consecutive block
+        return [self.create_account(account_type, owner, **kwargs) for account_type, owner, kwargs in specs]
+
+    def prepare_debit(self, legs):
+        """Validate and reserve the source side of cross-shard transfers."""
+        results = array("b")
+        for transfer_id, account_id, counterparty_id, amount in legs:
+            account = self.accounts.get(account_id)
+            if account is None:
+                results.append(OP_ACCOUNT_NOT_FOUND)
+                continue
+            error = check_amount(account.check_withdraw, amount)
+            if error is not None:
+                results.append(ERROR_CODES[type(error)])
+                continue
+            account._balance -= amount
+            self._pending[transfer_id] = (True, account_id, counterparty_id, amount)
+            results.append(OP_OK)
+        return results
+
+    def prepare_credit(self, legs):
+        """Validate the target side of cross-shard transfers."""
+        results = array("b")
+        for transfer_id, account_id, counterparty_id, amount in legs:
+            account = self.accounts.get(account_id)
+            if account is None:
+                results.append(OP_ACCOUNT_NOT_FOUND)
+                continue
+            error = check_amount(account.check_deposit, amount)
+            if error is not None:
+                results.append(ERROR_CODES[type(error)])
+                continue
+            self._pending[transfer_id] = (False, account_id, counterparty_id, amount)
+            results.append(OP_OK)
+        return results
+
+    def finish(self, committed, aborted):
+        """Second phase: apply committed transfer legs, release aborted ones."""
+        for transfer_id in committed:
+            is_debit, account_id, counterparty_id, amount = self._pending.pop(transfer_id)
+            if is_debit:
+                self.transactions.record(TX_TRANSFER, amount, account_id, counterparty_id)
+            else:
+                self.accounts[account_id]._balance += amount
+                self.transactions.record(TX_TRANSFER, amount, counterparty_id, account_id)
+        for transfer_id in aborted:
+            is_debit, account_id, _, amount = self._pending.pop(transfer_id)
+            if is_debit:
+                self.accounts[account_id]._balance += amount
+
+    def balances(self):
+        return {account_id: account.balance for account_id, account in self.accounts.items()}
+
+
+def _serve_shard(connection, shard, shards, minor_units):
+    bank = ShardBank(shard, shards, minor_units)
+    while True:
+        method, args, kwargs = connection.recv()
+        if method is None:
+            break
+        try:
+            result = getattr(bank, method)(*args, **kwargs)
+            if method == "create_account":
+                result = result.account_id
+            connection.send((True, result))
+        except Exception as e:
+            connection.send((False, e))
+    connection.close()
+
+
+# =====================
+# Sharded Bank
+# =====================
+
+class ShardedBank:
+    """
+    Bank whose accounts are partitioned by ``account_id`` across processes.
+
+    Each shard is a worker process owning a ShardBank. Deposits and
+    withdrawals are routed to the owning shard. Transfers between shards
+    use two-phase commit: the source reserves the funds and the target
+    validates the account (prepare); both then commit, or the source
+    refunds the reservation (abort). A cross-shard transfer is journaled
+    on both shards.
+
+    Unlike Bank, ``create_account`` returns the new account id: account
+    objects live in the shard processes.
+    """
+
+    def __init__(self, shards=None, minor_units=None):
+        self.shards = shards or os.cpu_count() or 1
+        self.minor_units = minor_units
+        self._transfer_ids = itertools.count()
+        self._created = 0
+        self._connections = []
+        self._processes = []
+        for shard in range(self.shards):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_serve_shard, args=(child, shard, self.shards, minor_units),
+                                              daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        for connection in self._connections:
+            connection.send((None, (), {}))
+            connection.close()
+        for process in self._processes:
+            process.join()
+        self._connections = []
+        self._processes = []
+
+    def shard_of(self, account_id):
+        if not isinstance(account_id, int):
+            raise AccountNotFoundError("Account not found")
+        return account_id % self.shards
+
+    def _send(self, shard, method, *args, **kwargs):
+        self._connections[shard].send((method, args, kwargs))
+
+    def _receive(self, shard):
+        ok, result = self._connections[shard].recv()
+        if not ok:
+            raise result
+        return result
+
+    def _call(self, shard, method, *args, **kwargs):
+        self._send(shard, method, *args, **kwargs)
+        return self._receive(shard)
+
+    def _broadcast(self, requests):
+        """
+        Send ``{shard: (method, args)}`` to all shards at once, then collect
+        replies. Every reply to a sent request is read before the first
+        error is raised, so no stale reply is left on a connection.
+        """
+        sent, error = [], None
+        try:
+            for shard, (method, args) in requests.items():
+                self._send(shard, method, *args)
+                sent.append(shard)
+        except Exception as e:
+            error = e
+        replies = {}
+        for shard in sent:
+            try:
+                replies[shard] = self._receive(shard)
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
+        return replies
+
+    def create_account(self, account_type, owner, **kwargs):
+        # round-robin keeps every shard's id sequence dense
+        account_id = self._call(self._created % self.shards, "create_account", account_type, owner, **kwargs)
+        self._created += 1
+        return account_id
+
+    def deposit(self, account_id, amount):
+        self._call(self.shard_of(account_id), "deposit", account_id, amount)
+
+    def withdraw(self, account_id, amount):
+        self._call(self.shard_of(account_id), "withdraw", account_id, amount)
+
+    def transfer(self, from_id, to_id, amount):
+        if from_id == to_id:
+            raise ValueError("Cannot transfer to the same account")
+        source_shard = self.shard_of(from_id)
+        if source_shard == self.shard_of(to_id):
+            self._call(source_shard, "transfer", from_id, to_id, amount)
+            return
+        (code,) = self._transfer_across_shards([(from_id, to_id, amount)])
+        error = error_for_code(code)
+        if error is not None:
+            raise error
+
+    def apply_batch(self, ops):
+        """
+        Post ``(tx_type, source_id, target_id, amount)`` operations; returns OP_* codes.
+
+        Operations owned by a single shard are sent to it as one
+        ``apply_batch`` call, with all shards working in parallel.
+        Cross-shard transfers follow in one two-phase round. Order is kept
+        within a shard, not across shards.
+        """
+        ops = list(ops)
+        results = array("b", bytes(len(ops)))
+        local = {}
+        cross_positions, cross = [], []
+        for position, op in enumerate(ops):
+            try:
+                tx_type, source_id, target_id, amount = op
+            except (TypeError, ValueError):  # not a 4-field row
+                results[position] = OP_INVALID_TYPE
+                continue
+            try:
+                shard = self.shard_of(source_id)
+                cross_shard = (
+                    tx_type in _TRANSFER_TYPES and source_id != target_id and shard != self.shard_of(target_id)
+                )
+            except AccountNotFoundError:  # not an int id
+                results[position] = OP_ACCOUNT_NOT_FOUND
+                continue
+            if cross_shard:
+                cross_positions.append(position)
+                cross.append((source_id, target_id, amount))
+            else:
+                local.setdefault(shard, []).append(position)
+
+        replies = self._broadcast({
+            shard: ("apply_batch", ([ops[position] for position in positions],))
+            for shard, positions in local.items()
+        })
+        for shard, codes in replies.items():
+            for position, code in zip(local[shard], codes):
+                results[position] = code
+
+        if cross:
+            for position, code in zip(cross_positions, self._transfer_across_shards(cross)):
+                results[position] = code
+        return results
+
+    def _transfer_across_shards(self, transfers):
+        """Two-phase commit for ``(from_id, to_id, amount)`` rows; returns OP_* codes."""
+        ids = [next(self._transfer_ids) for _ in transfers]
+        debits, credits = {}, {}
+        for transfer_id, (from_id, to_id, amount) in zip(ids, transfers):
+            debits.setdefault(self.shard_of(from_id), []).append((transfer_id, from_id, to_id, amount))
+            credits.setdefault(self.shard_of(to_id), []).append((transfer_id, to_id, from_id, amount))
+
+        # Phase 1: both sides vote
+        debit_codes, credit_codes = {}, {}
+        for shard, codes in self._broadcast({s: ("prepare_debit", (legs,)) for s, legs in debits.items()}).items():
+            debit_codes.update(zip((leg[0] for leg in debits[shard]), codes))
+        for shard, codes in self._broadcast({s: ("prepare_credit", (legs,)) for s, legs in credits.items()}).items():
+            credit_codes.update(zip((leg[0] for leg in credits[shard]), codes))
+
+        # Phase 2: commit where both voted yes, abort every other prepared leg
+        committed = {t for t in ids if debit_codes[t] == OP_OK and credit_codes[t] == OP_OK}
+        decisions = {}
+        for votes, legs_by_shard in ((debit_codes, debits), (credit_codes, credits)):
+            for shard, legs in legs_by_shard.items():
+                commit, abort = decisions.setdefault(shard, ([], []))
+                for transfer_id, *_ in legs:
+                    if transfer_id in committed:
+                        commit.append(transfer_id)
+                    elif votes[transfer_id] == OP_OK:
+                        abort.append(transfer_id)
+        self._broadcast({shard: ("finish", lists) for shard, lists in decisions.items()})
+
+        return [debit_codes[t] if debit_codes[t] != OP_OK else credit_codes[t] for t in ids]
+
+    def balances(self):
+        """Balances of all accounts, keyed by account id."""
+        merged = {}
+        for balances in self._broadcast({shard: ("balances", ()) for shard in range(self.shards)}).values():
+            merged.update(balances)
+        return merged
@@ -0,0 +1,154 @@
+import mmap
+import os
+import struct
+from array import array
+
+from bank import (
+    CheckingAccount,
+    SavingsAccount,
+    datetime_to_ns,
+    ns_to_datetime,
+)
+
+# =====================
+# File layout
+# =====================
+#
+#   header
+#   account records (fixed size, one per account)
+#   owner names (utf-8, concatenated)         - array block
+#   journal columns (5 array blocks)
+#   per-account index: ids, lengths, positions (3 array blocks)
+#
+# An array block is its typecode, byte length and raw machine bytes.
+
+MAGIC = b"BANKSNAP"
+VERSION = 2
+
+# magic, version, WAL offset, id counter, account count, minor units (0: float money)
+HEADER = struct.Struct("<8sIqqqq")
+# id, kind, balance, withdrawal limit, overdraft limit, periods per year,
+# rate, last capitalized ns, owner offset, owner length
+ACCOUNT = struct.Struct("<qBdddqdqII")
+# same, with balance and limits as integer minor units (fixed-point banks)
+ACCOUNT_EXACT = struct.Struct("<qBqqqqdqII")
+ARRAY_BLOCK = struct.Struct("<cq")
+
+KIND_CHECKING = 0
+KIND_SAVINGS = 1
+
+
+def _write_array(f, values):
+    f.write(ARRAY_BLOCK.pack(values.typecode.encode("ascii"), len(values) * values.itemsize))
+    values.tofile(f)
+
+
+def _read_array(buffer, offset):
+    typecode, size = ARRAY_BLOCK.unpack_from(buffer, offset)
+    start = offset + ARRAY_BLOCK.size
+    values = array(typecode.decode("ascii"))
+    values.frombytes(buffer[start:start + size])
+    return values, start + size
+
+
+# =====================
+# Snapshots
+# =====================
+
+def write_snapshot(bank, path, wal_offset=0):
+    """
+    Write the accounts and journal of ``bank`` to ``path``.
+
+    ``wal_offset`` is the write-ahead log position the snapshot is
+    consistent with; recovery replays only the log from there. The file is
+    written beside ``path`` and renamed into place, so a crash never leaves
+    a half-written snapshot.
+    """
+    layout = ACCOUNT if bank.minor_units is None else ACCOUNT_EXACT
+    owners = bytearray()
+    records = bytearray()
+    for account in bank.accounts.values():
+        owner = account.owner.encode("utf-8")
+        if isinstance(account, SavingsAccount):
+            records += layout.pack(
+                account.account_id, KIND_SAVINGS, account.balance, account.withdrawal_limit, 0,
+                account.capitalization_periods_per_year, account.annual_interest_rate,
+                datetime_to_ns(account.last_capitalized_at), len(owners), len(owner),
+            )
+        else:
+            records += layout.pack(
+                account.account_id, KIND_CHECKING, account.balance, account.withdrawal_limit,
+                account.overdraft_limit, 0, 0.0, 0, len(owners), len(owner),
+            )
+        owners += owner
+
+    index_ids, index_lengths, index_positions = array("q"), array("q"), array("q")
+    for account_id, positions in bank.transactions.index_items():
+        index_ids.append(account_id)
+        index_lengths.append(len(positions))
+        index_positions.extend(positions)
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, wal_offset, bank._counter, len(bank.accounts), bank.minor_units or 0))
+        f.write(records)
+        _write_array(f, array("B", owners))
+        for column in bank.transactions.columns():
+            _write_array(f, column)
+        for column in (index_ids, index_lengths, index_positions):
+            _write_array(f, column)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def load_snapshot(path, bank):
+    """
+    Load a snapshot written by write_snapshot into an empty ``bank``.
+
+    The file is memory-mapped and decoded in bulk: account records with
+    ``struct.iter_unpack`` and journal columns as raw array copies, so
+    loading costs one pass over the accounts and no per-posting work.
+    Returns the WAL offset to resume replay from.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        magic, version, wal_offset, counter, count, minor_units = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a bank snapshot")
+        if (minor_units or None) != bank.minor_units:
+            raise ValueError("Snapshot money representation does not match the bank")
+
+        layout = ACCOUNT if bank.minor_units is None else ACCOUNT_EXACT
+        records_start = HEADER.size
+        records_end = records_start + count * layout.size
+        owners, offset = _read_array(buffer, records_end)
+        owners = owners.tobytes()
+
+        for (account_id, kind, balance, withdrawal_limit, overdraft_limit, periods, rate,
+             last_capitalized_ns, owner_offset, owner_length) in layout.iter_unpack(buffer[records_start:records_end]):
+            owner = owners[owner_offset:owner_offset + owner_length].decode("utf-8")
+            if kind == KIND_SAVINGS:
+                account = SavingsAccount(
+                    account_id, owner, periods, rate, withdrawal_limit, ns_to_datetime(last_capitalized_ns)
+                )
+            else:
+                account = CheckingAccount(account_id, owner, withdrawal_limit, overdraft_limit)
+            account = bank._register(account)
+            account._balance = balance
+        bank._counter = counter
+
+        columns = []
+        for _ in range(5):
+            column, offset = _read_array(buffer, offset)
+            columns.append(column)
+        index_ids, offset = _read_array(buffer, offset)
+        index_lengths, offset = _read_array(buffer, offset)
+        index_positions, offset = _read_array(buffer, offset)
+
+    index = {}
+    start = 0
+    for account_id, length in zip(index_ids, index_lengths):
+        index[account_id] = index_positions[start:start + length]
+        start += length
+    bank.transactions.load_columns(tuple(columns), index)
+    return wal_offset
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+from bank import NO_ACCOUNT, TX_TYPES, format_amount
+
+DEFAULT_CHUNK_ROWS = 8_192
+
+# One "] TYPE | " piece per transaction type code
+_TYPE_PIECES = tuple(f"] {tx_type.upper()} | " for tx_type in TX_TYPES)
+
+
+# =====================
+# Rendering
+# =====================
+
+def _render(journal, positions, out, chunk_rows):
+    """
+    Write the journal rows at ``positions`` to ``out`` in the
+    ``Transaction.__str__`` format, one per line.
+
+    Rows are formatted straight from the journal columns. The timestamp
+    text is reused while consecutive rows fall in the same second (rows
+    come in timestamp order, so that is most of them on a busy account)
+    and lines are joined and written a chunk at a time.
+    """
+    tx_types, amounts, sources, targets, timestamps = journal.columns()
+    minor_units = journal.minor_units
+    last_second = None
+    stamp = ""
+    lines = []
+    written = 0
+
+    for position in positions:
+        second = timestamps[position] // 1_000_000_000
+        if second != last_second:
+            last_second = second
+            stamp = datetime.fromtimestamp(second).strftime("[%Y-%m-%d %H:%M:%S")
+        target = targets[position]
+        lines.append(
+            f"{stamp}{_TYPE_PIECES[tx_types[position]]}"
+            f"{format_amount(amounts[position], minor_units)} | "
+            f"{sources[position]}{'' if target == NO_ACCOUNT else f' -> {target}'}\n"
+        )
+        if len(lines) == chunk_rows:
+            out.write("".join(lines))
+            written += len(lines)
+            lines.clear()
+
+    if lines:
+        out.write("".join(lines))
+        written += len(lines)
+    return written
+
+
+def render_transactions(journal, out, since=None, until=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Write every posting with ``since <= timestamp < until`` to ``out``; returns the line count."""
+    return _render(journal, range(*journal.position_range(since, until)), out, chunk_rows)
+
+
+def render_statement(bank, account_id, out, since=None, until=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Write a statement for one account to ``out``: the account summary
+    (``str(account)``) followed by its postings, oldest first, optionally
+    bounded by ``since``/``until``. Returns the number of posting lines.
+    """
+    account = bank._get_account(account_id)
+    out.write(f"{account}\n")
+    journal = bank.transactions
+    positions, start, stop = journal.account_position_range(account_id, since, until)
+    return _render(journal, positions[start:stop], out, chunk_rows)
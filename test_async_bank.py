@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from bank import (
+    ACCOUNT_CHECKING,
+    Bank,
+    InvalidAmountError,
+    InsufficientFundsError,
+    AccountNotFoundError,
+)
+from async_bank import AsyncBank
+
+from config_test import bank
+
+
+def _checking(bank, owner):
+    return bank.create_account(
+        ACCOUNT_CHECKING,
+        owner,
+        withdrawal_limit=10_000,
+        overdraft_limit=0,
+    )
+
+
+# =========================================================
+# AsyncBank
+# =========================================================
+
+def test_operations_are_coalesced_into_batches(bank):
+    a = _checking(bank, "A")
+    b = _checking(bank, "B")
+
+    async def scenario():
+        async with AsyncBank(bank, max_batch=1_000) as front:
+            await asyncio.gather(*(front.deposit(a.account_id, 1) for _ in range(200)))
+            await front.transfer(a.account_id, b.account_id, 50)
+            await front.withdraw(b.account_id, 20)
+            return front.metrics
+
+    metrics = asyncio.run(scenario())
+
+    assert a.balance == 150
+    assert b.balance == 30
+    assert metrics.operations == 202
+    assert metrics.batches < metrics.operations
+    assert metrics.errors == 0
+    assert metrics.mean_latency >= 0
+
+
+def test_errors_are_raised_to_the_caller(bank):
+    a = _checking(bank, "A")
+
+    async def scenario():
+        async with AsyncBank(bank) as front:
+            with pytest.raises(InsufficientFundsError):
+                await front.withdraw(a.account_id, 10)
+            with pytest.raises(AccountNotFoundError):
+                await front.deposit(999, 10)
+            with pytest.raises(ValueError):
+                await front.transfer(a.account_id, a.account_id, 10)
+            return front.metrics
+
+    metrics = asyncio.run(scenario())
+
+    assert metrics.errors == 3
+    assert len(bank.transactions) == 0
+
+
+class _FailingOnceBank(Bank):
+    """Bank whose first apply_batch fails, like a log write on a full disk."""
+
+    failed = False
+
+    def apply_batch(self, ops):
+        if not self.failed:
+            self.failed = True
+            raise OSError("No space left on device")
+        return super().apply_batch(ops)
+
+
+def test_failed_batch_is_raised_and_the_worker_keeps_running():
+    bank = _FailingOnceBank()
+    a = _checking(bank, "A")
+
+    async def scenario():
+        front = AsyncBank(bank)
+        front.start()
+        with pytest.raises(OSError):
+            await asyncio.wait_for(front.deposit(a.account_id, 10), timeout=5)
+        with pytest.raises(InvalidAmountError):
+            await asyncio.wait_for(front.deposit(a.account_id, "x"), timeout=5)
+        await asyncio.wait_for(front.deposit(a.account_id, 5), timeout=5)
+        await asyncio.wait_for(front.close(), timeout=5)
+        return front.metrics
+
+    metrics = asyncio.run(scenario())
+
+    assert a.balance == 5
+    assert metrics.errors == 2
+
+
+def test_bounded_queue_applies_everything(bank):
+    a = _checking(bank, "A")
+
+    async def scenario():
+        async with AsyncBank(bank, max_queue=4, max_batch=3) as front:
+            await asyncio.gather(*(front.deposit(a.account_id, 1) for _ in range(50)))
+            return front.metrics
+
+    metrics = asyncio.run(scenario())
+
+    assert a.balance == 50
+    assert metrics.batches >= 50 // 3
@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta
+
 import pytest
 
 from bank import (
@@ -8,6 +10,18 @@ from bank import (
     TX_DEPOSIT,
     TX_WITHDRAW,
     TX_TRANSFER,
+    TX_CODES,
+    OP_OK,
+    OP_INVALID_AMOUNT,
+    OP_INSUFFICIENT_FUNDS,
+    OP_WITHDRAWAL_LIMIT,
+    OP_ACCOUNT_NOT_FOUND,
+    OP_SAME_ACCOUNT,
+    OP_INVALID_TYPE,
+    Transaction,
+    TransactionJournal,
+    Bank,
+    format_amount,
     InvalidAmountError,
     InsufficientFundsError,
     WithdrawalLimitError,
@@ -314,4 +328,449 @@ def test_account_ids_are_unique(bank):
         ACCOUNT_CHECKING, "B", withdrawal_limit=100, overdraft_limit=-50
     )
 
-    assert acc1.account_id != acc2.account_id
\ No newline at end of file
+    assert acc1.account_id != acc2.account_id
+
+
+# =========================================================
+# Transaction journal
+# =========================================================
+
+def test_journal_materializes_transactions():
+    journal = TransactionJournal()
+    journal.record(TX_DEPOSIT, 100, 0)
+    journal.record(TX_TRANSFER, 25.5, 0, 1)
+
+    assert len(journal) == 2
+
+    deposit, transfer = journal
+    assert deposit.tx_type == TX_DEPOSIT
+    assert deposit.amount == 100
+    assert deposit.source_account_id == 0
+    assert deposit.target_account_id is None
+
+    assert transfer.tx_type == TX_TRANSFER
+    assert transfer.amount == 25.5
+    assert transfer.target_account_id == 1
+    assert "TRANSFER | 25.50 | 0 -> 1" in str(transfer)
+
+
+def test_journal_indexing_and_slicing():
+    journal = TransactionJournal()
+    for amount in (1, 2, 3):
+        journal.record(TX_DEPOSIT, amount, 0)
+
+    assert journal[-1].amount == 3
+    assert [tx.amount for tx in journal[1:]] == [2, 3]
+
+    with pytest.raises(IndexError):
+        journal[3]
+
+
+def test_journal_append_preserves_timestamp():
+    journal = TransactionJournal()
+    tx = Transaction(TX_WITHDRAW, 10, 4)
+
+    journal.append(tx)
+
+    assert journal[0].timestamp == tx.timestamp
+    assert journal[0].tx_type == TX_WITHDRAW
+
+
+# =========================================================
+# Bank: batch posting
+# =========================================================
+
+def test_apply_batch_posts_operations(bank, checking_empty, checking_for_overdraft):
+    src = checking_for_overdraft.account_id
+    dst = checking_empty.account_id
+
+    results = bank.apply_batch([
+        (TX_DEPOSIT, dst, None, 50),
+        (TX_WITHDRAW, src, None, 100),
+        (TX_CODES[TX_TRANSFER], src, dst, 25),
+    ])
+
+    assert list(results) == [OP_OK, OP_OK, OP_OK]
+    assert checking_empty.balance == 75
+    assert checking_for_overdraft.balance == 175
+    assert [tx.tx_type for tx in bank.transactions] == [TX_DEPOSIT, TX_WITHDRAW, TX_TRANSFER]
+    assert bank.transactions[-1].target_account_id == dst
+
+
+def test_apply_batch_reports_errors_without_raising(
+    bank, checking_empty, checking_for_overdraft, checking_for_withdraw_limit
+):
+    src = checking_for_overdraft.account_id
+    limited = checking_for_withdraw_limit.account_id
+    empty = checking_empty.account_id
+
+    results = bank.apply_batch([
+        (TX_DEPOSIT, src, None, 0),
+        (TX_WITHDRAW, empty, None, 10),
+        (TX_WITHDRAW, limited, None, 101),
+        (TX_DEPOSIT, 999, None, 10),
+        (TX_TRANSFER, src, 999, 10),
+        (TX_TRANSFER, src, src, 10),
+        ("refund", src, None, 10),
+        (TX_DEPOSIT, src, None, 10),
+    ])
+
+    assert list(results) == [
+        OP_INVALID_AMOUNT,
+        OP_INSUFFICIENT_FUNDS,
+        OP_WITHDRAWAL_LIMIT,
+        OP_ACCOUNT_NOT_FOUND,
+        OP_ACCOUNT_NOT_FOUND,
+        OP_SAME_ACCOUNT,
+        OP_INVALID_TYPE,
+        OP_OK,
+    ]
+    assert checking_for_overdraft.balance == 310
+    assert checking_empty.balance == 0
+    assert len(bank.transactions) == 1
+
+
+def test_apply_batch_classifies_malformed_rows(bank, checking_empty, checking_for_overdraft):
+    src = checking_for_overdraft.account_id
+    dst = checking_empty.account_id
+
+    results = bank.apply_batch([
+        (TX_DEPOSIT, src, None, 10),
+        (TX_DEPOSIT, src, None, "5"),
+        (TX_WITHDRAW, src, None, None),
+        (TX_TRANSFER, src, dst, "5"),
+        (TX_DEPOSIT, [src], None, 10),
+        (TX_TRANSFER, src, {dst}, 10),
+        ([TX_DEPOSIT], src, None, 10),
+        (TX_DEPOSIT, src, None),
+        (TX_TRANSFER, src, dst, 5, "extra"),
+        None,
+        (TX_DEPOSIT, dst, None, 20),
+    ])
+
+    assert list(results) == [
+        OP_OK,
+        OP_INVALID_AMOUNT,
+        OP_INVALID_AMOUNT,
+        OP_INVALID_AMOUNT,
+        OP_ACCOUNT_NOT_FOUND,
+        OP_ACCOUNT_NOT_FOUND,
+        OP_INVALID_TYPE,
+        OP_INVALID_TYPE,
+        OP_INVALID_TYPE,
+        OP_INVALID_TYPE,
+        OP_OK,
+    ]
+    assert checking_for_overdraft.balance == 310
+    assert checking_empty.balance == 20
+    assert len(bank.transactions) == 2
+
+
+# =========================================================
+# Bank: per-account history
+# =========================================================
+
+def test_transactions_for_includes_both_transfer_sides(bank, checking_empty, checking_for_overdraft):
+    src = checking_for_overdraft.account_id
+    dst = checking_empty.account_id
+
+    bank.deposit(src, 10)
+    bank.deposit(dst, 20)
+    bank.transfer(src, dst, 5)
+    bank.withdraw(src, 1)
+
+    assert [tx.tx_type for tx in bank.transactions_for(src)] == [TX_DEPOSIT, TX_TRANSFER, TX_WITHDRAW]
+    assert [tx.tx_type for tx in bank.transactions_for(dst)] == [TX_DEPOSIT, TX_TRANSFER]
+
+
+def test_transactions_for_time_bounds(bank, checking_empty):
+    acc_id = checking_empty.account_id
+    for second, amount in enumerate((1, 2, 3)):
+        bank.transactions.record(TX_DEPOSIT, amount, acc_id, timestamp_ns=(1_700_000_000 + second) * 10**9)
+    middle = bank.transactions[1].timestamp
+    last = bank.transactions[2].timestamp
+
+    assert [tx.amount for tx in bank.transactions_for(acc_id, since=middle)] == [2, 3]
+    assert [tx.amount for tx in bank.transactions_for(acc_id, until=middle)] == [1]
+    assert [tx.amount for tx in bank.transactions_for(acc_id, since=middle, until=last)] == [2]
+
+
+def test_transactions_for_unknown_account(bank):
+    with pytest.raises(AccountNotFoundError):
+        bank.transactions_for(999)
+
+
+# =========================================================
+# Bank: time-range queries
+# =========================================================
+
+def _seconds(second):
+    return (1_700_000_000 + second) * 10**9
+
+
+def test_transactions_between_uses_half_open_range(bank, checking_empty):
+    acc_id = checking_empty.account_id
+    for second in range(5):
+        bank.transactions.record(TX_DEPOSIT, second + 1, acc_id, timestamp_ns=_seconds(second))
+    start = bank.transactions[1].timestamp
+    end = bank.transactions[3].timestamp
+
+    assert [tx.amount for tx in bank.transactions_between(start, end)] == [2, 3]
+    assert [tx.amount for tx in bank.transactions_between(since=end)] == [4, 5]
+    assert [tx.amount for tx in bank.transactions_between(until=start)] == [1]
+    assert bank.transactions_between(end, start) == []
+
+
+def test_account_position_range_bisects_one_account():
+    journal = TransactionJournal()
+    for second in range(6):
+        journal.record(TX_DEPOSIT, second + 1, second % 2, timestamp_ns=_seconds(second))
+
+    positions, start, stop = journal.account_position_range(1, journal[2].timestamp, journal[5].timestamp)
+    assert list(positions[start:stop]) == [3]
+    positions, start, stop = journal.account_position_range(0)
+    assert list(positions[start:stop]) == [0, 2, 4]
+    assert journal.account_position_range(7, until=journal[5].timestamp)[1:] == (0, 0)
+
+
+def test_recent_transactions(bank, checking_empty):
+    acc_id = checking_empty.account_id
+    old = datetime.now() - timedelta(hours=1)
+    bank.transactions.record(TX_DEPOSIT, 1, acc_id, timestamp_ns=int(old.timestamp()) * 10**9)
+    bank.deposit(acc_id, 2)
+
+    assert [tx.amount for tx in bank.recent_transactions(timedelta(minutes=5))] == [2]
+
+
+def test_journal_clamps_clock_regressions():
+    journal = TransactionJournal()
+    journal.record(TX_DEPOSIT, 1, 0, timestamp_ns=_seconds(10))
+    journal.record(TX_DEPOSIT, 2, 0, timestamp_ns=_seconds(5))
+
+    assert journal.clock_regressions == 1
+    assert journal[1].timestamp == journal[0].timestamp
+
+
+# =========================================================
+# Bank: fixed-point (minor unit) money
+# =========================================================
+
+@pytest.fixture
+def cents_bank():
+    return Bank(minor_units=100)
+
+
+def test_fixed_point_balances_are_exact_integers(cents_bank):
+    a = cents_bank.create_account(ACCOUNT_CHECKING, "A", withdrawal_limit=10_000, overdraft_limit=0)
+    b = cents_bank.create_account(ACCOUNT_CHECKING, "B", withdrawal_limit=10_000, overdraft_limit=0)
+
+    for _ in range(10):
+        cents_bank.deposit(a.account_id, 10)  # 0.10 ten times
+    cents_bank.transfer(a.account_id, b.account_id, 30)
+
+    assert a.balance == 70 and isinstance(a.balance, int)
+    assert b.balance == 30 and isinstance(b.balance, int)
+    assert cents_bank.transactions.columns()[1].typecode == "q"
+    assert "Balance: 0.70" in str(a)
+    assert "TRANSFER | 0.30 | 0 -> 1" in str(cents_bank.transactions[-1])
+
+
+def test_fixed_point_rejects_fractional_amounts(cents_bank):
+    acc = cents_bank.create_account(ACCOUNT_CHECKING, "A", withdrawal_limit=10_000, overdraft_limit=-500)
+
+    with pytest.raises(InvalidAmountError):
+        cents_bank.deposit(acc.account_id, 10.5)
+    with pytest.raises(InvalidAmountError):
+        cents_bank.withdraw(acc.account_id, 0.5)
+    assert list(cents_bank.apply_batch([(TX_DEPOSIT, acc.account_id, None, 1.25)])) == [OP_INVALID_AMOUNT]
+    assert acc.balance == 0
+
+
+@pytest.mark.parametrize("account_type, kwargs", [
+    (ACCOUNT_CHECKING, {"withdrawal_limit": 1000.0, "overdraft_limit": 0}),
+    (ACCOUNT_CHECKING, {"withdrawal_limit": 1000, "overdraft_limit": -0.5}),
+    (ACCOUNT_SAVINGS, {"capitalization_periods_per_year": 12, "annual_interest_rate": 5, "withdrawal_limit": 10.5}),
+])
+def test_fixed_point_rejects_fractional_limits(cents_bank, account_type, kwargs):
+    with pytest.raises(ValueError):
+        cents_bank.create_account(account_type, "A", **kwargs)
+    with pytest.raises(ValueError):
+        cents_bank.create_accounts([(ACCOUNT_CHECKING, "B", {"withdrawal_limit": 1, "overdraft_limit": 0}),
+                                    (account_type, "A", kwargs)])
+    assert cents_bank.accounts == {}
+
+
+def test_fixed_point_interest_is_rounded_to_minor_units(cents_bank):
+    savings = cents_bank.create_account(
+        ACCOUNT_SAVINGS,
+        "Saver",
+        capitalization_periods_per_year=12,
+        annual_interest_rate=6,
+        withdrawal_limit=10_000,
+    )
+    cents_bank.deposit(savings.account_id, 100_001)
+    start = savings.last_capitalized_at = datetime.now()
+
+    cents_bank.capitalize_interest(as_of=start + timedelta(days=45))
+
+    assert savings.balance == 100_001 + round(100_001 * 0.005)
+    assert isinstance(savings.balance, int)
+
+
+@pytest.mark.parametrize("minor_units", [0, 3, 250, 1.0])
+def test_minor_units_must_be_power_of_ten(minor_units):
+    with pytest.raises(ValueError):
+        Bank(minor_units=minor_units)
+
+
+@pytest.mark.parametrize("amount, minor_units, expected", [
+    (12.5, None, "12.50"),
+    (12345, 100, "123.45"),
+    (-5, 100, "-0.05"),
+    (7, 1, "7"),
+    (1005, 1000, "1.005"),
+])
+def test_format_amount(amount, minor_units, expected):
+    assert format_amount(amount, minor_units) == expected
+
+
+# =========================================================
+# Compact (slotted) objects
+# =========================================================
+
+def test_accounts_and_transactions_have_no_instance_dict(bank, checking_empty, savings_for_balance):
+    bank.deposit(checking_empty.account_id, 10)
+
+    for obj in (checking_empty, savings_for_balance, bank.transactions[0]):
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.unexpected = 1
+
+
+# =========================================================
+# Bank: columnar account store
+# =========================================================
+
+@pytest.fixture
+def columnar_bank():
+    bank = Bank(columnar_accounts=True)
+    for owner, balance, overdraft in (("A", 500, -100), ("B", 20, -50), ("C", 0, -50)):
+        acc = bank.create_account(ACCOUNT_CHECKING, owner, withdrawal_limit=1_000, overdraft_limit=overdraft)
+        if balance:
+            bank.deposit(acc.account_id, balance)
+    savings = bank.create_account(
+        ACCOUNT_SAVINGS,
+        "S",
+        capitalization_periods_per_year=12,
+        annual_interest_rate=4,
+        withdrawal_limit=100,
+    )
+    bank.deposit(savings.account_id, 800)
+    return bank
+
+
+def test_columnar_accounts_are_views_over_the_store(columnar_bank):
+    store = columnar_bank.account_store
+    a, b, c, savings = (columnar_bank.accounts[i] for i in range(4))
+
+    columnar_bank.transfer(a.account_id, c.account_id, 90)
+    with pytest.raises(WithdrawalLimitError):
+        columnar_bank.withdraw(savings.account_id, 101)
+
+    assert list(store.balances) == [410, 20, 90, 800]
+    assert c.balance == 90
+    assert savings.annual_interest_rate == 4
+    assert store.interest_rates[savings.account_id] == 4
+    assert "Balance: 410.00" in str(a)
+
+    b.overdraft_limit = -10
+    assert store.overdraft_limits[b.account_id] == -10
+
+
+def test_columnar_aggregates(columnar_bank):
+    from bank import KIND_CHECKING, KIND_SAVINGS
+    store = columnar_bank.account_store
+
+    assert store.count() == 4
+    assert store.count(KIND_SAVINGS) == 1
+    assert store.total_balance() == 1_320
+    assert store.total_balance(KIND_CHECKING) == 520
+    assert store.ids_below(100) == [1, 2]
+    assert store.ids_below(100, KIND_SAVINGS) == []
+    assert store.top_balances(2) == [(3, 800), (0, 500)]
+
+    columnar_bank.withdraw(1, 65)
+    assert store.ids_near_overdraft(margin=10) == [1]
+    assert store.ids_below(0) == [1]
+
+
+def test_columnar_accounts_with_fixed_point_and_capitalization():
+    bank = Bank(minor_units=100, columnar_accounts=True)
+    savings = bank.create_account(
+        ACCOUNT_SAVINGS,
+        "S",
+        capitalization_periods_per_year=1,
+        annual_interest_rate=5,
+        withdrawal_limit=100,
+    )
+    bank.deposit(savings.account_id, 10_000)
+    start = savings.last_capitalized_at = datetime.now()
+
+    bank.capitalize_interest(as_of=start + timedelta(days=365))
+
+    assert bank.account_store.balances.typecode == "q"
+    assert bank.account_store.total_balance() == 10_500
+
+
+# =========================================================
+# Bank: point-in-time balances
+# =========================================================
+
+def _replayed_balance(journal, account_id, moment):
+    balance = 0
+    for tx in journal:
+        if tx.timestamp > moment:
+            break
+        if tx.source_account_id == account_id:
+            balance += -tx.amount if tx.tx_type in (TX_WITHDRAW, TX_TRANSFER) else tx.amount
+        elif tx.target_account_id == account_id:
+            balance += tx.amount
+    return balance
+
+
+def test_balance_after_matches_full_replay():
+    journal = TransactionJournal()
+    journal.balance_checkpoint_interval = 3
+    for second in range(20):
+        journal.record(TX_DEPOSIT, second + 1, second % 2, timestamp_ns=_seconds(second))
+        journal.record(TX_TRANSFER, 0.5, 0, 1, timestamp_ns=_seconds(second))
+        if second % 3 == 0:
+            journal.record(TX_WITHDRAW, 2, 1, timestamp_ns=_seconds(second))
+
+    for second in (-1, 0, 4, 7, 19):
+        moment = datetime.fromtimestamp(_seconds(second) // 10**9)
+        for account_id in (0, 1, 2):
+            assert journal.balance_after(account_id, moment) == _replayed_balance(journal, account_id, moment)
+
+
+def test_balance_at_now_is_current_balance(bank, checking_empty):
+    savings_empty = bank.create_account(
+        ACCOUNT_SAVINGS,
+        "Eve",
+        capitalization_periods_per_year=12,
+        annual_interest_rate=4,
+        withdrawal_limit=1_000,
+    )
+    for amount in range(1, 200):
+        bank.deposit(checking_empty.account_id, amount * 0.1)
+    bank.transfer(checking_empty.account_id, savings_empty.account_id, 99.9)
+    bank.withdraw(savings_empty.account_id, 12.5)
+    savings_empty.last_capitalized_at -= timedelta(days=400)
+    bank.capitalize_interest()
+
+    now = datetime.now()
+    assert bank.balance_at(checking_empty.account_id, now) == checking_empty.balance
+    assert bank.balance_at(savings_empty.account_id, now) == savings_empty.balance
+    assert bank.balance_at(savings_empty.account_id, datetime(2000, 1, 1)) == 0
+    with pytest.raises(AccountNotFoundError):
+        bank.balance_at(999, now)
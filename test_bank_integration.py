@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta
+
 import pytest
 
 from bank import (
@@ -8,6 +10,7 @@ from bank import (
     TX_DEPOSIT,
     TX_WITHDRAW,
     TX_TRANSFER,
+    TX_INTEREST,
     InsufficientFundsError,
     WithdrawalLimitError,
 )
@@ -238,3 +241,102 @@ def test_zero_interest_rate_results_in_zero_interest(bank):
     )
 
     assert interest == 1000.0
+
+
+# =========================================================
+# Integration: interest capitalization
+# =========================================================
+
+def test_capitalize_interest_credits_savings_accounts(bank):
+    monthly = bank.create_account(
+        ACCOUNT_SAVINGS,
+        "Monthly",
+        capitalization_periods_per_year=12,
+        annual_interest_rate=6,
+        withdrawal_limit=10_000,
+    )
+    yearly = bank.create_account(
+        ACCOUNT_SAVINGS,
+        "Yearly",
+        capitalization_periods_per_year=1,
+        annual_interest_rate=5,
+        withdrawal_limit=10_000,
+    )
+    checking = bank.create_account(
+        ACCOUNT_CHECKING,
+        "Checking",
+        withdrawal_limit=10_000,
+        overdraft_limit=0,
+    )
+    for account in (monthly, yearly, checking):
+        bank.deposit(account.account_id, 1000)
+    start = datetime.now()
+    monthly.last_capitalized_at = start
+    yearly.last_capitalized_at = start
+
+    credited = bank.capitalize_interest(as_of=start + timedelta(days=365))
+
+    assert credited == 2
+    assert monthly.balance == pytest.approx(1000 * 1.005 ** 12, rel=1e-12)
+    assert yearly.balance == pytest.approx(1050.0, rel=1e-12)
+    assert checking.balance == 1000
+    assert [tx.tx_type for tx in bank.transactions[3:]] == [TX_INTEREST, TX_INTEREST]
+    assert "INTEREST" in str(bank.transactions[-1])
+
+
+def test_capitalize_interest_only_counts_completed_periods(bank):
+    savings = bank.create_account(
+        ACCOUNT_SAVINGS,
+        "Saver",
+        capitalization_periods_per_year=12,
+        annual_interest_rate=6,
+        withdrawal_limit=10_000,
+    )
+    bank.deposit(savings.account_id, 1000)
+    start = savings.last_capitalized_at = datetime.now()
+
+    assert bank.capitalize_interest(as_of=start + timedelta(days=20)) == 0
+    assert bank.capitalize_interest(as_of=start + timedelta(days=40)) == 1
+    assert savings.balance == pytest.approx(1005.0, rel=1e-12)
+
+    # the same date again posts nothing: the period is already capitalized
+    assert bank.capitalize_interest(as_of=start + timedelta(days=40)) == 0
+    assert len(bank.transactions) == 2
+
+
+def test_capitalize_interest_ignores_money_deposited_after_the_periods(bank):
+    savings = bank.create_account(
+        ACCOUNT_SAVINGS,
+        "Saver",
+        capitalization_periods_per_year=12,
+        annual_interest_rate=6,
+        withdrawal_limit=10_000,
+    )
+    # empty for a year, funded today
+    savings.last_capitalized_at = datetime.now() - timedelta(days=365)
+    bank.deposit(savings.account_id, 1_000_000)
+
+    assert bank.capitalize_interest() == 0
+    assert savings.balance == 1_000_000
+
+
+def test_capitalize_interest_uses_each_periods_opening_balance(bank):
+    savings = bank.create_account(
+        ACCOUNT_SAVINGS,
+        "Saver",
+        capitalization_periods_per_year=12,
+        annual_interest_rate=6,
+        withdrawal_limit=10_000,
+    )
+    period = timedelta(days=365 / 12)
+    # the deposit lands in the middle of the first period
+    start = savings.last_capitalized_at = datetime.now() - period / 2
+    bank.deposit(savings.account_id, 1000)
+
+    assert bank.capitalize_interest(as_of=start + 3 * period, posted_at=start + 10 * period) == 1
+    # nothing in period 1, then 1000 compounding over periods 2 and 3
+    assert savings.balance == pytest.approx(1000 * 1.005 ** 2, rel=1e-12)
+
+    # that interest is stamped after period 4 starts but still earns in it
+    assert bank.capitalize_interest(as_of=start + 4 * period) == 1
+    assert savings.balance == pytest.approx(1000 * 1.005 ** 3, rel=1e-12)
@@ -0,0 +1,136 @@
+import io
+from datetime import timedelta
+
+import pytest
+
+from bank import (
+    Bank,
+    CheckingAccount,
+    SavingsAccount,
+    ACCOUNT_CHECKING,
+    ACCOUNT_SAVINGS,
+    TX_DEPOSIT,
+)
+from bulk_import import import_accounts
+from concurrent_bank import ConcurrentBank
+from config_test import bank
+from wal import DurableBank
+
+HEADER = "account_type,owner,withdrawal_limit,overdraft_limit,capitalization_periods_per_year,annual_interest_rate,opening_balance\n"
+
+
+def _source(*lines):
+    return io.StringIO(HEADER + "".join(line + "\n" for line in lines))
+
+
+# =========================================================
+# Bank.create_accounts
+# =========================================================
+
+def test_create_accounts_allocates_one_block(bank):
+    bank.create_account(ACCOUNT_CHECKING, "First", withdrawal_limit=1, overdraft_limit=0)
+
+    accounts = bank.create_accounts([
+        (ACCOUNT_SAVINGS, "S", {"capitalization_periods_per_year": 4, "annual_interest_rate": 2, "withdrawal_limit": 9}),
+        (ACCOUNT_CHECKING, "C", {"withdrawal_limit": 5, "overdraft_limit": -5}),
+    ])
+
+    assert [a.account_id for a in accounts] == [1, 2]
+    assert isinstance(bank.accounts[1], SavingsAccount)
+    assert isinstance(bank.accounts[2], CheckingAccount)
+    assert bank.create_account(ACCOUNT_CHECKING, "Next", withdrawal_limit=1, overdraft_limit=0).account_id == 3
+
+
+def test_create_accounts_is_all_or_nothing(bank):
+    with pytest.raises(ValueError):
+        bank.create_accounts([
+            (ACCOUNT_CHECKING, "C", {"withdrawal_limit": 5, "overdraft_limit": -5}),
+            ("brokerage", "X", {}),
+        ])
+
+    assert bank.accounts == {}
+
+
+# =========================================================
+# import_accounts
+# =========================================================
+
+def test_import_accounts_and_opening_balances(bank):
+    report = import_accounts(bank, _source(
+        "checking,Alice,1000,-100,,,250.5",
+        "savings,Bożena,500,,12,3.5,1000",
+        "checking,Carol,1000,-100,,,",
+    ), chunk_rows=2)
+
+    assert report.accounts == 3
+    assert report.opening_balances == 2
+    assert report.rejected == []
+    assert report.accounts_per_minute > 0
+    assert [a.owner for a in bank.accounts.values()] == ["Alice", "Bożena", "Carol"]
+    assert [a.balance for a in bank.accounts.values()] == [250.5, 1000, 0]
+    assert bank.accounts[1].capitalization_periods_per_year == 12
+    assert [tx.tx_type for tx in bank.transactions] == [TX_DEPOSIT, TX_DEPOSIT]
+
+
+def test_imported_opening_balances_earn_interest_from_the_first_period(bank):
+    bank.deposit(bank.create_account(ACCOUNT_CHECKING, "Early", withdrawal_limit=1, overdraft_limit=0).account_id, 1)
+    import_accounts(bank, _source("savings,A,500,,12,3.6,1000"))
+    account = bank.accounts[1]
+
+    assert bank.transactions[-1].timestamp == account.last_capitalized_at
+    credited = bank.capitalize_interest(as_of=account.last_capitalized_at + timedelta(days=31))
+
+    assert credited == 1
+    assert account.balance == pytest.approx(1003)
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "brokerage,X,1,1,,,",
+        ",X,1,1,,,",
+        "checking,,1,1,,,",
+        "checking,X,lots,1,,,",
+        "savings,X,1,,0,3,",
+        "checking,X,1,1,,,-5",
+        "checking,X,1",
+    ],
+)
+def test_invalid_rows_are_rejected_with_line_numbers(bank, line):
+    report = import_accounts(bank, _source("checking,Ok,1,0,,,", line))
+
+    assert report.accounts == 1
+    assert [number for number, _ in report.rejected] == [3]
+
+
+def test_missing_columns_raise(bank):
+    with pytest.raises(ValueError):
+        import_accounts(bank, io.StringIO("account_type,owner\nchecking,X\n"))
+
+
+def test_fixed_point_import_uses_minor_units():
+    bank = Bank(minor_units=100)
+
+    report = import_accounts(bank, _source("checking,A,100000,-500,,,12345", "checking,B,1,0,,,1.5"))
+
+    assert report.accounts == 1
+    assert bank.accounts[0].balance == 12345
+    assert isinstance(bank.accounts[0].overdraft_limit, int)
+
+
+def test_import_into_concurrent_and_durable_banks(tmp_path):
+    lines = ("checking,A,1000,-100,,,10", "savings,B,500,,4,2,20")
+
+    concurrent = ConcurrentBank()
+    import_accounts(concurrent, _source(*lines))
+    concurrent.transfer(1, 0, 5)
+    assert concurrent.accounts[0].balance == 15
+
+    path = str(tmp_path / "bank.wal")
+    durable = DurableBank.open(path)
+    import_accounts(durable, _source(*lines))
+    durable.close()
+    recovered = DurableBank.open(path)
+    assert [a.balance for a in recovered.accounts.values()] == [10, 20]
+    assert recovered.accounts[1].last_capitalized_at == recovered.transactions[-1].timestamp
+    recovered.close()
@@ -190,4 +190,37 @@ def test_transfer_same_account_shows_invalid_input(monkeypatch, capsys):
 def test_input_exhaustion_triggers_exit(monkeypatch, capsys):
     # No inputs -> helper's fake input returns "0" immediately
     out = _run_cli_with_inputs([], monkeypatch, capsys)
-    assert "Goodbye!" in out
\ No newline at end of file
+    assert "Goodbye!" in out
+
+def test_export_transactions_to_csv(monkeypatch, capsys, tmp_path):
+    path = tmp_path / "transactions.csv"
+    inputs = [
+        "1",      # Create Account
+        "1",      # checking
+        "A",      # owner
+        "1000",   # wl
+        "-100",   # od
+        "2",      # Deposit
+        "0",      # Account ID
+        "500",    # Amount
+        "8",      # Export Transactions
+        "1",      # csv
+        str(path),
+    ]
+    out = _run_cli_with_inputs(inputs, monkeypatch, capsys)
+    assert "Exported 1 transactions" in out
+    assert path.read_text().splitlines()[1].endswith(",deposit,500.0,0,")
+
+
+def test_export_to_bad_path_shows_error(monkeypatch, capsys, tmp_path):
+    path = tmp_path / "missing" / "transactions.csv"
+    inputs = [
+        "8",      # Export Transactions
+        "1",      # csv
+        str(path),
+        "5",      # Show Accounts: the CLI is still running
+    ]
+    out = _run_cli_with_inputs(inputs, monkeypatch, capsys)
+    assert "Error: " in out
+    assert "No such file or directory" in out
+    assert out.count("Menu:") >= 2
@@ -0,0 +1,188 @@
+import threading
+import time
+
+import pytest
+
+from bank import (
+    ACCOUNT_CHECKING,
+    ACCOUNT_SAVINGS,
+    TX_DEPOSIT,
+    TX_TRANSFER,
+    OP_OK,
+    OP_INVALID_AMOUNT,
+    OP_ACCOUNT_NOT_FOUND,
+    OP_INVALID_TYPE,
+    AccountNotFoundError,
+    InsufficientFundsError,
+)
+from concurrent_bank import ConcurrentBank, OptimisticBank
+
+
+# =========================================================
+# Fixtures
+# =========================================================
+
+@pytest.fixture(params=[ConcurrentBank, OptimisticBank])
+def bank(request):
+    return request.param()
+
+
+def _open(bank, count, balance):
+    accounts = []
+    for i in range(count):
+        account = bank.create_account(
+            ACCOUNT_CHECKING,
+            f"Owner {i}",
+            withdrawal_limit=10_000,
+            overdraft_limit=0,
+        )
+        if balance:
+            bank.deposit(account.account_id, balance)
+        accounts.append(account)
+    return accounts
+
+
+def _run_threads(target, count):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+# =========================================================
+# Concurrency
+# =========================================================
+
+def test_concurrent_account_creation_allocates_unique_ids(bank):
+    def create(_):
+        for _ in range(200):
+            bank.create_account(ACCOUNT_CHECKING, "X", withdrawal_limit=1, overdraft_limit=0)
+
+    _run_threads(create, 8)
+
+    assert sorted(bank.accounts) == list(range(1_600))
+
+
+def test_opposite_transfers_do_not_deadlock_and_conserve_money(bank):
+    a, b = _open(bank, 2, 10_000)
+
+    def shuffle(i):
+        src, dst = (a, b) if i % 2 else (b, a)
+        for _ in range(500):
+            bank.transfer(src.account_id, dst.account_id, 1)
+
+    _run_threads(shuffle, 8)
+
+    assert a.balance + b.balance == 20_000
+    assert a.balance == 10_000
+    assert len(bank.transactions) == 2 + 8 * 500
+
+
+def test_concurrent_deposits_are_not_lost(bank):
+    (account,) = _open(bank, 1, 0)
+
+    def deposit(_):
+        for _ in range(1_000):
+            bank.deposit(account.account_id, 1)
+
+    _run_threads(deposit, 8)
+
+    assert account.balance == 8_000
+    assert len(bank.transactions_for(account.account_id)) == 8_000
+
+
+def test_apply_batch_and_capitalize_interest(bank):
+    a, b = _open(bank, 2, 100)
+    savings = bank.create_account(
+        ACCOUNT_SAVINGS,
+        "Saver",
+        capitalization_periods_per_year=12,
+        annual_interest_rate=6,
+        withdrawal_limit=100,
+    )
+
+    results = bank.apply_batch([
+        (TX_DEPOSIT, savings.account_id, None, 50),
+        (TX_TRANSFER, a.account_id, b.account_id, 30),
+    ])
+
+    assert list(results) == [OP_OK, OP_OK]
+    assert b.balance == 130
+    assert bank.capitalize_interest() == 0
+
+
+def test_apply_batch_with_malformed_rows(bank):
+    a, b = _open(bank, 2, 100)
+
+    results = bank.apply_batch([
+        (TX_DEPOSIT, [a.account_id], None, 5),
+        (TX_TRANSFER, a.account_id, b.account_id, None),
+        (TX_DEPOSIT, a.account_id),
+        None,
+        (TX_TRANSFER, a.account_id, b.account_id, 30),
+    ])
+
+    assert list(results) == [OP_ACCOUNT_NOT_FOUND, OP_INVALID_AMOUNT, OP_INVALID_TYPE, OP_INVALID_TYPE, OP_OK]
+    assert (a.balance, b.balance) == (70, 130)
+
+
+def test_stale_batch_stamp_is_not_a_clock_regression(bank):
+    (a,) = _open(bank, 1, 0)
+    stamp = time.time_ns()
+    bank.deposit(a.account_id, 1)  # another thread's posting wins the journal lock
+
+    bank.transactions.record(TX_DEPOSIT, 1, a.account_id, timestamp_ns=stamp)
+
+    assert bank.transactions.clock_regressions == 0
+    assert bank.transactions[1].timestamp == bank.transactions[0].timestamp
+
+    # a journal ahead of the clock is still a regression
+    bank.transactions.record(TX_DEPOSIT, 1, a.account_id, timestamp_ns=time.time_ns() + 3_600 * 10**9)
+    bank.deposit(a.account_id, 1)
+    assert bank.transactions.clock_regressions == 1
+
+
+def test_unknown_account_raises(bank):
+    (account,) = _open(bank, 1, 10)
+
+    with pytest.raises(AccountNotFoundError):
+        bank.deposit(42, 1)
+    with pytest.raises(AccountNotFoundError):
+        bank.transfer(account.account_id, 42, 1)
+
+
+# =========================================================
+# Optimistic commits
+# =========================================================
+
+def test_optimistic_versions_count_committed_changes():
+    bank = OptimisticBank()
+    a, b = _open(bank, 2, 100)
+
+    bank.transfer(a.account_id, b.account_id, 10)
+    with pytest.raises(InsufficientFundsError):
+        bank.withdraw(a.account_id, 1_000)
+    bank.apply_batch([(TX_DEPOSIT, a.account_id, None, 5)])
+
+    assert (a.version, b.version) == (3, 2)
+    assert (a.balance, b.balance) == (95, 110)
+
+
+def test_optimistic_hot_source_never_overdraws():
+    bank = OptimisticBank()
+    (payroll,) = _open(bank, 1, 1_000)
+    payees = _open(bank, 8, 0)
+
+    def pay(i):
+        for _ in range(400):
+            try:
+                bank.transfer(payroll.account_id, payees[i].account_id, 1)
+            except InsufficientFundsError:
+                pass
+
+    _run_threads(pay, 8)
+
+    assert payroll.balance == 0
+    assert sum(payee.balance for payee in payees) == 1_000
+    assert len(bank.transactions) == 1 + 1_000
@@ -0,0 +1,117 @@
+import csv
+import io
+from datetime import datetime
+
+import pytest
+
+from bank import Bank, ACCOUNT_CHECKING, TX_CODES, TX_DEPOSIT, TX_TRANSFER, TX_WITHDRAW, NO_ACCOUNT
+from config_test import bank
+from export import export_columnar, export_csv, read_columnar
+
+
+# =========================================================
+# Helpers
+# =========================================================
+
+def _moment(second):
+    return datetime(2024, 1, 1, 12, 0, second)
+
+
+def _populate(bank):
+    for owner in ("A", "B"):
+        bank.create_account(ACCOUNT_CHECKING, owner, withdrawal_limit=10_000, overdraft_limit=-100)
+    journal = bank.transactions
+    # explicit timestamps so the time filters are deterministic
+    journal.record(TX_DEPOSIT, 100.5, 0, timestamp_ns=int(_moment(1).timestamp()) * 10**9)
+    journal.record(TX_DEPOSIT, 20, 1, timestamp_ns=int(_moment(2).timestamp()) * 10**9)
+    journal.record(TX_TRANSFER, 0.1, 0, 1, timestamp_ns=int(_moment(3).timestamp()) * 10**9)
+    journal.record(TX_WITHDRAW, 7, 1, timestamp_ns=int(_moment(4).timestamp()) * 10**9)
+    journal.record(TX_DEPOSIT, 3, 0, timestamp_ns=int(_moment(5).timestamp()) * 10**9)
+
+
+def _csv_rows(bank, **filters):
+    out = io.StringIO()
+    count = export_csv(bank, out, **filters)
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    assert len(rows) == count + 1
+    return rows
+
+
+# =========================================================
+# CSV
+# =========================================================
+
+def test_csv_export_writes_every_posting(bank):
+    _populate(bank)
+
+    header, *rows = _csv_rows(bank, chunk_rows=2)
+
+    assert header == ["timestamp", "type", "amount", "source_account_id", "target_account_id"]
+    assert rows[0] == [_moment(1).isoformat(), "deposit", "100.5", "0", ""]
+    assert rows[2] == [_moment(3).isoformat(), "transfer", "0.1", "0", "1"]
+    assert [tx.tx_type for tx in bank.transactions] == [row[1] for row in rows]
+
+
+@pytest.mark.parametrize(
+    "filters, expected_amounts",
+    [
+        ({"since": _moment(2), "until": _moment(4)}, ["20", "0.1"]),
+        ({"account_id": 0}, ["100.5", "0.1", "3"]),
+        ({"account_id": 1, "since": _moment(3)}, ["0.1", "7"]),
+        ({"account_id": 1, "until": _moment(1)}, []),
+    ],
+)
+def test_csv_export_filters(bank, filters, expected_amounts):
+    _populate(bank)
+
+    rows = _csv_rows(bank, chunk_rows=1, **filters)[1:]
+
+    assert [float(row[2]) for row in rows] == [float(a) for a in expected_amounts]
+
+
+def test_csv_export_of_fixed_point_amounts_is_exact():
+    bank = Bank(minor_units=100)
+    acc = bank.create_account(ACCOUNT_CHECKING, "A", withdrawal_limit=10**18, overdraft_limit=0)
+    bank.deposit(acc.account_id, 2**53 + 1)
+
+    rows = _csv_rows(bank)
+
+    assert rows[1][2] == "90071992547409.93"
+
+
+# =========================================================
+# Columnar
+# =========================================================
+
+def test_columnar_export_round_trip(bank, tmp_path):
+    _populate(bank)
+    path = tmp_path / "transactions.cols"
+
+    with open(path, "wb") as f:
+        assert export_columnar(bank, f, chunk_rows=2) == 5
+
+    groups = list(read_columnar(str(path)))
+    assert [len(group[0]) for group in groups] == [2, 2, 1]
+    joined = [sum((list(group[i]) for group in groups), []) for i in range(5)]
+    assert joined == [list(column) for column in bank.transactions.columns()]
+
+
+def test_columnar_export_with_account_filter(bank, tmp_path):
+    _populate(bank)
+    path = tmp_path / "transactions.cols"
+
+    with open(path, "wb") as f:
+        export_columnar(bank, f, account_id=1)
+
+    (tx_types, amounts, sources, targets, _), = read_columnar(str(path))
+    assert list(tx_types) == [TX_CODES[TX_DEPOSIT], TX_CODES[TX_TRANSFER], TX_CODES[TX_WITHDRAW]]
+    assert list(amounts) == [20, 0.1, 7]
+    assert list(targets) == [NO_ACCOUNT, 1, NO_ACCOUNT]
+
+
+def test_read_columnar_rejects_other_files(tmp_path):
+    path = tmp_path / "other"
+    path.write_bytes(b"x" * 64)
+
+    with pytest.raises(ValueError):
+        list(read_columnar(str(path)))
@@ -1,7 +1,11 @@
+from datetime import date
+from decimal import Decimal
+from itertools import islice
+
 import pytest
 
-from bank import ACCOUNT_SAVINGS, ACCOUNT_CHECKING
-from finance_tools import CompoundInterestCalculator
+from bank import ACCOUNT_SAVINGS, ACCOUNT_CHECKING, Bank
+from finance_tools import AccrualRow, CompoundInterestCalculator, growth_factor
 from config_test import bank
 
 
@@ -71,4 +75,150 @@ def test_calculate_savings_account_compound_interest_invalid_days_type(bank):
     )
     acc.deposit(500)
     with pytest.raises(ValueError):
-        CompoundInterestCalculator.calculate_savings_account_compound_interest(acc, "30")
\ No newline at end of file
+        CompoundInterestCalculator.calculate_savings_account_compound_interest(acc, "30")
+
+
+# =========================================================
+# Portfolio (vectorized) projection tests
+# =========================================================
+
+def test_portfolio_compound_interest_matches_scalar():
+    capitals = [1000, 2000.5, 0]
+    days = [365, 182, 30]
+    periods = [1, 12, 365]
+    rates = [5, 6, 0.5]
+
+    finals = CompoundInterestCalculator.calculate_portfolio_compound_interest(capitals, days, periods, rates)
+
+    expected = [
+        CompoundInterestCalculator.calculate_compound_interest(*args)
+        for args in zip(capitals, days, periods, rates)
+    ]
+    assert list(finals) == pytest.approx(expected, rel=1e-12)
+
+def test_portfolio_compound_interest_broadcasts_scalars():
+    finals = CompoundInterestCalculator.calculate_portfolio_compound_interest([1000, 2000], 365, 1, 5)
+    assert list(finals) == pytest.approx([1050.0, 2100.0], rel=1e-9)
+
+def test_portfolio_compound_interest_empty():
+    assert len(CompoundInterestCalculator.calculate_portfolio_compound_interest([], [], [], [])) == 0
+
+@pytest.mark.parametrize("args", [
+    (["1000"], 365, 1, 5),
+    ([1000], [365.5], 1, 5),
+    ([1000], 365, [0], 5),
+    ([1000], 365, 12, [-1]),
+    ([-100], 365, 12, 5),
+    ([1000], [-10], 12, 5),
+    ([1000, 2000], [365, 30, 10], 12, 5),
+])
+def test_portfolio_compound_interest_invalid_inputs(args):
+    with pytest.raises(ValueError):
+        CompoundInterestCalculator.calculate_portfolio_compound_interest(*args)
+
+def test_bank_compound_interest_projects_savings_only(bank):
+    savings = bank.create_account(
+        ACCOUNT_SAVINGS,
+        "Saver",
+        capitalization_periods_per_year=12,
+        annual_interest_rate=6,
+        withdrawal_limit=1000,
+    )
+    bank.create_account(
+        ACCOUNT_CHECKING,
+        "Spender",
+        withdrawal_limit=1000,
+        overdraft_limit=-100,
+    )
+    savings.deposit(1000)
+
+    account_ids, finals = CompoundInterestCalculator.calculate_bank_compound_interest(bank, 365)
+
+    assert list(account_ids) == [savings.account_id]
+    assert finals[0] == pytest.approx(1000 * (1 + 0.06 / 12) ** 12, rel=1e-9)
+
+def test_fixed_point_projection_returns_minor_units():
+    cents_bank = Bank(minor_units=100)
+    acc = cents_bank.create_account(
+        ACCOUNT_SAVINGS,
+        "Cents",
+        capitalization_periods_per_year=12,
+        annual_interest_rate=6,
+        withdrawal_limit=1000,
+    )
+    cents_bank.deposit(acc.account_id, 100_000)
+
+    final = CompoundInterestCalculator.calculate_savings_account_compound_interest(acc, 365)
+    account_ids, finals = CompoundInterestCalculator.calculate_bank_compound_interest(cents_bank, 365)
+
+    assert final == round(100_000 * (1 + 0.06 / 12) ** 12)
+    assert isinstance(final, int)
+    assert finals.typecode == "q"
+    assert list(finals) == [final]
+
+def test_growth_factors_are_cached_per_product_and_horizon():
+    growth_factor.cache_clear()
+
+    CompoundInterestCalculator.calculate_portfolio_compound_interest(
+        [100, 200, 300, 400], 365, [12, 12, 4, 12], [3.5, 3.5, 3.5, 3.5]
+    )
+    CompoundInterestCalculator.calculate_compound_interest(50, 365, 12, 3.5)
+
+    info = growth_factor.cache_info()
+    assert (info.misses, info.hits) == (2, 3)
+    assert info.maxsize is not None
+
+def test_log_space_growth_is_accurate_for_long_horizons():
+    # 30 years of daily capitalization at 0.01%: (1 + r) ** n is off by
+    # ~1e-12 relative, exp(n * log1p(r)) matches the exact value
+    days, periods, rate = 30 * 365, 365, 0.01
+    expected = float((1 + Decimal(rate) / 365 / 100) ** (30 * 365))
+
+    assert growth_factor(days, periods, rate) == pytest.approx(expected, rel=1e-15)
+
+
+def _saver(bank, owner, periods, rate, balance):
+    account = bank.create_account(
+        ACCOUNT_SAVINGS,
+        owner,
+        capitalization_periods_per_year=periods,
+        annual_interest_rate=rate,
+        withdrawal_limit=1000,
+    )
+    bank.deposit(account.account_id, balance)
+    return account
+
+def test_accrual_schedule_for_one_account(bank):
+    account = _saver(bank, "Saver", 12, 6, 1000)
+
+    rows = list(CompoundInterestCalculator.accrual_schedule(account, 800, start=date(2024, 1, 1)))
+
+    assert len(rows) == 800
+    assert rows[0] == AccrualRow(1, date(2024, 1, 2), account.account_id, rows[0].balance, rows[0].interest, rows[0].interest)
+    assert rows[0].balance == pytest.approx(1000 * growth_factor(1, 12, 6))
+    assert sum(row.interest for row in rows) == pytest.approx(rows[-1].accrued)
+    final = CompoundInterestCalculator.calculate_savings_account_compound_interest(account, 800)
+    assert rows[-1].balance == pytest.approx(final, rel=1e-13)
+    assert rows[364].balance == 1000 * growth_factor(365, 12, 6)
+
+def test_accrual_schedule_for_many_accounts_streams_day_by_day(bank):
+    a = _saver(bank, "A", 12, 6, 1000)
+    b = _saver(bank, "B", 365, 2, 500)
+
+    schedule = CompoundInterestCalculator.accrual_schedule([a, b], 10 * 365)
+    first_days = list(islice(schedule, 4))
+
+    assert [(row.day, row.account_id) for row in first_days] == [(1, a.account_id), (1, b.account_id),
+                                                                 (2, a.account_id), (2, b.account_id)]
+    assert first_days[3].balance == pytest.approx(500 * growth_factor(2, 365, 2))
+
+@pytest.mark.parametrize("accounts, days, error", [
+    ("not an account", 10, TypeError),
+    (None, 10.5, ValueError),
+    (None, -1, ValueError),
+])
+def test_accrual_schedule_invalid_inputs(bank, accounts, days, error):
+    accounts = accounts if accounts is not None else _saver(bank, "S", 12, 6, 1000)
+
+    with pytest.raises(error):
+        next(CompoundInterestCalculator.accrual_schedule(accounts, days))
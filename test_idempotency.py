@@ -0,0 +1,200 @@
+import threading
+import time
+
+import pytest
+
+from bank import Bank, ACCOUNT_CHECKING, InsufficientFundsError
+from concurrent_bank import ConcurrentBank, OptimisticBank
+from idempotency import IdempotencyCache
+from wal import DurableBank
+
+
+# =========================================================
+# Fixtures
+# =========================================================
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _bank(cls=Bank, **kwargs):
+    bank = cls(idempotency_cache=IdempotencyCache(**kwargs))
+    for owner in ("A", "B"):
+        bank.create_account(ACCOUNT_CHECKING, owner, withdrawal_limit=1_000, overdraft_limit=0)
+    return bank
+
+
+# =========================================================
+# IdempotencyCache
+# =========================================================
+
+def test_cache_runs_each_key_once_and_counts_hits():
+    cache = IdempotencyCache()
+    calls = []
+
+    for _ in range(3):
+        assert cache.run("k", ("op",), lambda: calls.append(1) or "done") == "done"
+
+    assert calls == [1]
+    assert (cache.metrics.hits, cache.metrics.misses) == (2, 1)
+    assert cache.metrics.hit_rate == pytest.approx(2 / 3)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = IdempotencyCache(max_entries=2)
+    cache.run("a", (), lambda: 1)
+    cache.run("b", (), lambda: 2)
+    cache.run("a", (), lambda: 1)  # "b" is now least recently used
+    cache.run("c", (), lambda: 3)
+
+    assert len(cache) == 2
+    assert cache.metrics.evictions == 1
+    assert cache.run("b", (), lambda: "again") == "again"
+
+
+def test_cache_entries_expire():
+    clock = FakeClock()
+    cache = IdempotencyCache(ttl_seconds=10, clock=clock)
+    cache.run("k", (), lambda: "first")
+
+    clock.now = 9.9
+    assert cache.run("k", (), lambda: "second") == "first"
+    clock.now = 10
+    assert cache.run("k", (), lambda: "second") == "second"
+    assert cache.metrics.expirations == 1
+
+
+def test_cache_rejects_key_reuse_for_other_request():
+    cache = IdempotencyCache()
+    cache.run("k", ("deposit", 0, 10), lambda: None)
+
+    with pytest.raises(ValueError):
+        cache.run("k", ("deposit", 0, 20), lambda: None)
+
+
+def test_unexpected_errors_are_not_remembered():
+    cache = IdempotencyCache()
+
+    with pytest.raises(ZeroDivisionError):
+        cache.run("k", (), lambda: 1 / 0)
+    assert cache.run("k", (), lambda: "retried") == "retried"
+
+
+def test_duplicate_in_flight_waits_for_original():
+    cache = IdempotencyCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return "original"
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.run("k", (), slow)))
+    first.start()
+    started.wait()
+    second = threading.Thread(target=lambda: results.append(cache.run("k", (), slow)))
+    second.start()
+    release.set()
+    first.join()
+    second.join()
+
+    assert results == ["original", "original"]
+    assert calls == [1]
+
+
+def test_in_flight_entries_are_never_expired_or_evicted():
+    clock = FakeClock()
+    cache = IdempotencyCache(max_entries=1, ttl_seconds=10, clock=clock)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return "original"
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.run("k", (), slow)))
+    second = threading.Thread(target=lambda: results.append(cache.run("k", (), slow)))
+    first.start()
+    try:
+        started.wait()
+        clock.now = 60
+        assert cache.run("other", (), lambda: "other") == "other"
+        assert len(cache) == 2  # over max_entries while "k" is in flight
+
+        second.start()
+        deadline = time.monotonic() + 5
+        while cache.metrics.hits == 0 and time.monotonic() < deadline:
+            time.sleep(0.001)
+    finally:
+        release.set()
+        first.join()
+        if second.is_alive():
+            second.join()
+
+    assert results == ["original", "original"]
+    assert calls == [1]
+    assert cache.metrics.expirations == 0
+    cache.run("next", (), lambda: None)
+    assert len(cache) == 1
+
+
+# =========================================================
+# Bank operations with idempotency keys
+# =========================================================
+
+@pytest.mark.parametrize("cls", [Bank, ConcurrentBank, OptimisticBank])
+def test_retried_operations_post_once(cls):
+    bank = _bank(cls)
+
+    for _ in range(2):
+        bank.deposit(0, 100, idempotency_key="dep-1")
+        bank.transfer(0, 1, 30, idempotency_key="tr-1")
+        bank.withdraw(1, 5, idempotency_key="wd-1")
+
+    assert (bank.accounts[0].balance, bank.accounts[1].balance) == (70, 25)
+    assert len(bank.transactions) == 3
+    assert bank.idempotency_cache.metrics.hits == 3
+
+
+def test_failed_outcome_is_replayed_not_retried():
+    bank = _bank()
+
+    with pytest.raises(InsufficientFundsError):
+        bank.withdraw(0, 50, idempotency_key="wd-1")
+    bank.deposit(0, 100)
+
+    with pytest.raises(InsufficientFundsError):
+        bank.withdraw(0, 50, idempotency_key="wd-1")
+    assert bank.accounts[0].balance == 100
+
+
+def test_key_without_cache_is_rejected():
+    bank = Bank()
+    bank.create_account(ACCOUNT_CHECKING, "A", withdrawal_limit=1, overdraft_limit=0)
+
+    with pytest.raises(ValueError):
+        bank.deposit(0, 1, idempotency_key="k")
+    assert len(bank.transactions) == 0
+
+
+def test_duplicates_are_not_logged(tmp_path):
+    path = str(tmp_path / "bank.wal")
+    bank = DurableBank.open(path, idempotency_cache=IdempotencyCache())
+    bank.create_account(ACCOUNT_CHECKING, "A", withdrawal_limit=1_000, overdraft_limit=0)
+    bank.deposit(0, 10, idempotency_key="k")
+    bank.deposit(0, 10, idempotency_key="k")
+    bank.close()
+
+    recovered = DurableBank.open(path)
+    assert recovered.accounts[0].balance == 10
+    recovered.close()
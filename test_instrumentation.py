@@ -0,0 +1,136 @@
+import asyncio
+import threading
+
+import pytest
+
+from async_bank import AsyncBank
+from bank import (
+    Bank,
+    ACCOUNT_CHECKING,
+    TX_DEPOSIT,
+    TX_WITHDRAW,
+    InsufficientFundsError,
+    AccountNotFoundError,
+)
+from concurrent_bank import ConcurrentBank
+from config_test import bank
+from instrumentation import Histogram, Instrumentation
+
+
+def _open(bank):
+    return bank.create_account(ACCOUNT_CHECKING, "A", withdrawal_limit=1_000, overdraft_limit=0)
+
+
+# =========================================================
+# Histogram
+# =========================================================
+
+def test_histogram_buckets_are_upper_bounds():
+    histogram = Histogram(buckets=(0.001, 0.01))
+    for seconds in (0.0005, 0.001, 0.005, 2):
+        histogram.observe(seconds)
+
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(2.0065)
+
+
+# =========================================================
+# Bank instrumentation
+# =========================================================
+
+def test_attached_bank_records_latency_and_errors(bank):
+    instrumentation = Instrumentation()
+    instrumentation.attach(bank)
+    account = _open(bank)
+
+    bank.deposit(account.account_id, 10)
+    with pytest.raises(InsufficientFundsError):
+        bank.withdraw(account.account_id, 50)
+    with pytest.raises(AccountNotFoundError):
+        bank.deposit(99, 1)
+    bank.apply_batch([(TX_WITHDRAW, account.account_id, None, 50), (TX_DEPOSIT, 99, None, 1)])
+
+    snapshot = instrumentation.snapshot()
+    assert snapshot["latency"]["deposit"]["count"] == 2
+    assert snapshot["latency"]["withdraw"]["count"] == 1
+    assert snapshot["latency"]["create_account"]["count"] == 1
+    assert snapshot["errors"] == {
+        "withdraw:InsufficientFundsError": 1,
+        "deposit:AccountNotFoundError": 1,
+        "apply_batch:InsufficientFundsError": 1,
+        "apply_batch:AccountNotFoundError": 1,
+    }
+    assert account.balance == 10
+
+
+def test_detach_restores_plain_methods():
+    bank = Bank()
+    instrumentation = Instrumentation()
+    instrumentation.attach(bank)
+    Instrumentation.detach(bank)
+
+    assert "deposit" not in vars(bank)
+    bank.deposit(_open(bank).account_id, 1)
+    assert instrumentation.snapshot()["latency"] == {}
+
+
+def test_concurrent_bank_lock_wait():
+    bank = ConcurrentBank()
+    instrumentation = Instrumentation()
+    instrumentation.attach(bank)
+    a, b = _open(bank), _open(bank)
+
+    def shuffle():
+        for _ in range(200):
+            bank.transfer(a.account_id, b.account_id, 1)
+            bank.transfer(b.account_id, a.account_id, 1)
+
+    bank.deposit(a.account_id, 10)
+    threads = [threading.Thread(target=shuffle) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert instrumentation.lock_wait.count == 1 + 4 * 400 * 2
+    assert a.balance + b.balance == 10
+    assert instrumentation.snapshot()["latency"]["transfer"]["count"] == 1_600
+
+
+def test_async_queue_wait():
+    async def scenario():
+        inner = Bank()
+        account = _open(inner)
+        instrumentation = Instrumentation()
+        async with instrumentation.attach_async(AsyncBank(inner)) as front:
+            await asyncio.gather(*(front.deposit(account.account_id, 1) for _ in range(50)))
+        return instrumentation
+
+    instrumentation = asyncio.run(scenario())
+
+    assert instrumentation.queue_wait.count == 50
+    assert instrumentation.latency["apply_batch"].count >= 1
+
+
+# =========================================================
+# Prometheus export
+# =========================================================
+
+def test_prometheus_dump(bank, tmp_path):
+    instrumentation = Instrumentation(buckets=(0.5, 1.0))
+    instrumentation.attach(bank)
+    account = _open(bank)
+    bank.deposit(account.account_id, 1)
+    with pytest.raises(InsufficientFundsError):
+        bank.withdraw(account.account_id, 5)
+
+    path = str(tmp_path / "bank.prom")
+    instrumentation.write_prometheus(path)
+    text = open(path, encoding="utf-8").read()
+
+    assert "# TYPE bank_operation_duration_seconds histogram" in text
+    assert 'bank_operation_duration_seconds_bucket{operation="deposit",le="+Inf"} 1' in text
+    assert 'bank_operation_duration_seconds_count{operation="withdraw"} 1' in text
+    assert 'bank_operation_errors_total{operation="withdraw",error="InsufficientFundsError"} 1' in text
+    assert "bank_lock_wait_seconds_count 0" in text
@@ -0,0 +1,118 @@
+import pytest
+
+from bank import ACCOUNT_SAVINGS, ACCOUNT_CHECKING
+from config_test import bank
+from finance_tools import CompoundInterestCalculator, growth_factor
+from scenarios import ScenarioEngine, random_rate_shifts
+
+
+# =========================================================
+# Helpers
+# =========================================================
+
+def _engine(**options):
+    return ScenarioEngine(
+        [1000, 2000, 500, 800, 100],
+        [12, 12, 4, 365, 1],
+        [3.0, 3.0, 1.5, 2.0, 5.0],
+        **options,
+    )
+
+
+def _blocks_as_matrix(engine, paths, **kwargs):
+    matrix = [[None] * len(engine) for _ in paths]
+    for account_start, scenario_start, block in engine.iter_blocks(paths, **kwargs):
+        width = min(engine.chunk_accounts, len(engine) - account_start)
+        for offset, value in enumerate(block):
+            scenario, account = divmod(offset, width)
+            matrix[scenario_start + scenario][account_start + account] = value
+    return matrix
+
+
+# =========================================================
+# Projection
+# =========================================================
+
+def test_flat_paths_match_fixed_rate_projection():
+    engine = _engine(workers=1)
+    flat = [[0.0] * 12]
+
+    (finals,) = _blocks_as_matrix(engine, flat, days_per_step=30)
+
+    expected = CompoundInterestCalculator.calculate_portfolio_compound_interest(
+        engine.capitals, 360, engine.periods_per_year, engine.annual_interest_rates
+    )
+    assert finals == pytest.approx(list(expected), rel=1e-12)
+
+
+def test_shifts_and_absolute_paths():
+    engine = _engine(workers=1)
+    path = [1.0, 2.0, -0.5]
+
+    shifted, = _blocks_as_matrix(engine, [path], days_per_step=365)
+    absolute, = _blocks_as_matrix(engine, [path], days_per_step=365, relative=False)
+
+    expected = 1000 * growth_factor(365, 12, 4.0) * growth_factor(365, 12, 5.0) * growth_factor(365, 12, 2.5)
+    assert shifted[0] == pytest.approx(expected, rel=1e-12)
+    assert absolute[4] == pytest.approx(100 * 1.01 * 1.02 * 0.995, rel=1e-12)
+
+
+def test_chunking_does_not_change_results():
+    paths = random_rate_shifts(7, 24, seed=1)
+
+    whole = _blocks_as_matrix(_engine(workers=1), paths)
+    chunked = _blocks_as_matrix(_engine(workers=1, chunk_accounts=2, chunk_scenarios=3), paths)
+
+    assert chunked == whole
+    assert list(_engine(workers=1, chunk_accounts=2, chunk_scenarios=3).book_totals(paths)) == pytest.approx(
+        [sum(row) for row in whole], rel=1e-12
+    )
+
+
+def test_process_pool_matches_inline():
+    paths = random_rate_shifts(20, 12, seed=2)
+
+    inline = _engine(workers=1, chunk_accounts=2, chunk_scenarios=4).book_totals(paths)
+    pooled = _engine(workers=2, chunk_accounts=2, chunk_scenarios=4).book_totals(paths)
+
+    assert list(pooled) == list(inline)
+
+
+def test_engine_from_bank_uses_savings_accounts(bank):
+    savings = bank.create_account(
+        ACCOUNT_SAVINGS,
+        "Saver",
+        capitalization_periods_per_year=12,
+        annual_interest_rate=6,
+        withdrawal_limit=1000,
+    )
+    bank.create_account(ACCOUNT_CHECKING, "Spender", withdrawal_limit=1000, overdraft_limit=-100)
+    bank.deposit(savings.account_id, 1000)
+
+    engine, account_ids = ScenarioEngine.from_bank(bank, workers=1)
+
+    assert list(account_ids) == [savings.account_id]
+    assert list(engine.book_totals([[0.0] * 12, [1.0] * 12], days_per_step=365 / 12)) == pytest.approx(
+        [1000 * growth_factor(365, 12, 6), 1000 * growth_factor(365, 12, 7)], rel=1e-12
+    )
+
+
+def test_random_rate_shifts_are_reproducible():
+    paths = random_rate_shifts(3, 5, step_stddev=0.25, seed=7)
+
+    assert len(paths) == 3 and all(len(path) == 5 for path in paths)
+    assert paths == random_rate_shifts(3, 5, step_stddev=0.25, seed=7)
+
+
+@pytest.mark.parametrize("args", [
+    ([1, 2], [12], [1.0, 2.0]),
+    ([1], [0], [1.0]),
+])
+def test_invalid_engine_inputs(args):
+    with pytest.raises(ValueError):
+        ScenarioEngine(*args)
+
+
+def test_ragged_paths_are_rejected():
+    with pytest.raises(ValueError):
+        _engine(workers=1).book_totals([[0.0, 1.0], [0.0]])
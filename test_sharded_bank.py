@@ -0,0 +1,176 @@
+import pytest
+
+from bank import (
+    ACCOUNT_CHECKING,
+    ACCOUNT_SAVINGS,
+    TX_DEPOSIT,
+    TX_TRANSFER,
+    OP_OK,
+    OP_INVALID_AMOUNT,
+    OP_INSUFFICIENT_FUNDS,
+    OP_ACCOUNT_NOT_FOUND,
+    OP_INVALID_TYPE,
+    InsufficientFundsError,
+    AccountNotFoundError,
+)
+from sharded_bank import ShardedBank
+
+
+# =========================================================
+# Fixtures
+# =========================================================
+
+@pytest.fixture
+def sharded():
+    with ShardedBank(shards=2) as bank:
+        yield bank
+
+
+def _checking(bank, owner, balance=0):
+    account_id = bank.create_account(
+        ACCOUNT_CHECKING,
+        owner,
+        withdrawal_limit=10_000,
+        overdraft_limit=0,
+    )
+    if balance:
+        bank.deposit(account_id, balance)
+    return account_id
+
+
+# =========================================================
+# Routing
+# =========================================================
+
+def test_accounts_are_spread_across_shards(sharded):
+    ids = [_checking(sharded, f"Owner {i}") for i in range(4)]
+
+    assert ids == [0, 1, 2, 3]
+    assert [sharded.shard_of(account_id) for account_id in ids] == [0, 1, 0, 1]
+
+
+def test_deposit_and_withdraw_are_routed(sharded):
+    a = _checking(sharded, "A", 100)
+    b = _checking(sharded, "B", 50)
+
+    sharded.withdraw(b, 20)
+
+    assert sharded.balances() == {a: 100, b: 30}
+    with pytest.raises(InsufficientFundsError):
+        sharded.withdraw(a, 500)
+    with pytest.raises(AccountNotFoundError):
+        sharded.deposit(99, 1)
+
+
+def test_invalid_account_type_does_not_skip_ids(sharded):
+    with pytest.raises(ValueError):
+        sharded.create_account("brokerage", "X")
+
+    assert _checking(sharded, "A") == 0
+
+
+# =========================================================
+# Cross-shard transfers (two-phase commit)
+# =========================================================
+
+def test_cross_shard_transfer_commits_both_sides(sharded):
+    a = _checking(sharded, "A", 100)
+    b = _checking(sharded, "B")
+    c = _checking(sharded, "C")
+
+    sharded.transfer(a, b, 40)  # shard 0 -> shard 1
+    sharded.transfer(a, c, 10)  # same shard
+
+    assert sharded.balances() == {a: 50, b: 40, c: 10}
+
+
+def test_cross_shard_transfer_insufficient_funds_changes_nothing(sharded):
+    a = _checking(sharded, "A", 100)
+    b = _checking(sharded, "B")
+
+    with pytest.raises(InsufficientFundsError):
+        sharded.transfer(a, b, 101)
+
+    assert sharded.balances() == {a: 100, b: 0}
+
+
+def test_cross_shard_transfer_to_missing_account_refunds_source(sharded):
+    a = _checking(sharded, "A", 100)
+
+    with pytest.raises(AccountNotFoundError):
+        sharded.transfer(a, 41, 30)
+
+    assert sharded.balances() == {a: 100}
+
+
+def test_apply_batch_mixes_local_and_cross_shard_ops(sharded):
+    a = _checking(sharded, "A", 100)
+    b = _checking(sharded, "B", 100)
+    savings = sharded.create_account(
+        ACCOUNT_SAVINGS,
+        "S",
+        capitalization_periods_per_year=12,
+        annual_interest_rate=5,
+        withdrawal_limit=1_000,
+    )
+
+    results = sharded.apply_batch([
+        (TX_DEPOSIT, savings, None, 10),
+        (TX_TRANSFER, a, b, 30),
+        (TX_TRANSFER, b, a, 500),
+        (TX_TRANSFER, a, savings, 20),
+        (TX_DEPOSIT, 77, None, 10),
+    ])
+
+    assert list(results) == [OP_OK, OP_OK, OP_INSUFFICIENT_FUNDS, OP_OK, OP_ACCOUNT_NOT_FOUND]
+    assert sharded.balances() == {a: 50, b: 130, savings: 30}
+
+
+def test_apply_batch_classifies_malformed_rows(sharded):
+    a = _checking(sharded, "A", 100)
+    b = _checking(sharded, "B", 100)
+
+    results = sharded.apply_batch([
+        (TX_DEPOSIT, "A", None, 10),
+        (TX_DEPOSIT, 1.5, None, 10),
+        (TX_DEPOSIT, "%d", None, 10),
+        (TX_TRANSFER, a, None, 10),
+        (TX_DEPOSIT, a, None, "5"),
+        (TX_TRANSFER, a, b, None),
+        (TX_DEPOSIT, a, None),
+        (TX_TRANSFER, a, b, 30),
+    ])
+
+    assert list(results) == [
+        OP_ACCOUNT_NOT_FOUND,
+        OP_ACCOUNT_NOT_FOUND,
+        OP_ACCOUNT_NOT_FOUND,
+        OP_ACCOUNT_NOT_FOUND,
+        OP_INVALID_AMOUNT,
+        OP_INVALID_AMOUNT,
+        OP_INVALID_TYPE,
+        OP_OK,
+    ]
+    assert sharded.balances() == {a: 70, b: 130}
+
+
+def test_non_int_ids_are_not_found(sharded):
+    a = _checking(sharded, "A", 100)
+
+    with pytest.raises(AccountNotFoundError):
+        sharded.deposit(1.5, 10)
+    assert list(sharded.apply_batch([(TX_DEPOSIT, a, None, 5), (TX_DEPOSIT, 1.5, None, 5)])) == [
+        OP_OK,
+        OP_ACCOUNT_NOT_FOUND,
+    ]
+    assert sharded.balances() == {a: 105}
+
+
+def test_failed_broadcast_leaves_no_stale_replies(sharded):
+    a = _checking(sharded, "A", 100)
+    b = _checking(sharded, "B", 100)
+
+    with pytest.raises(AttributeError):
+        sharded._broadcast({0: ("balances", ()), 1: ("no_such_method", ())})
+
+    assert sharded.balances() == {a: 100, b: 100}
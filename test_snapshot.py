@@ -0,0 +1,178 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from bank import (
+    Bank,
+    ACCOUNT_CHECKING,
+    ACCOUNT_SAVINGS,
+    TX_DEPOSIT,
+    TX_TRANSFER,
+)
+from snapshot import load_snapshot, write_snapshot
+from wal import DurableBank
+
+
+# =========================================================
+# Helpers
+# =========================================================
+
+def _populate(bank):
+    checking = bank.create_account(
+        ACCOUNT_CHECKING,
+        "Alice",
+        withdrawal_limit=1_000,
+        overdraft_limit=-100,
+    )
+    savings = bank.create_account(
+        ACCOUNT_SAVINGS,
+        "Bożena",
+        capitalization_periods_per_year=4,
+        annual_interest_rate=3.5,
+        withdrawal_limit=500,
+    )
+    bank.deposit(checking.account_id, 500)
+    bank.transfer(checking.account_id, savings.account_id, 120.5)
+    bank.withdraw(checking.account_id, 30)
+    return checking, savings
+
+
+def _state(bank):
+    return (
+        bank._counter,
+        {
+            i: (type(a).__name__, a.owner, a.balance, a.withdrawal_limit, getattr(a, "last_capitalized_at", None))
+            for i, a in bank.accounts.items()
+        },
+        [(tx.tx_type, tx.amount, tx.source_account_id, tx.target_account_id, tx.timestamp) for tx in bank.transactions],
+    )
+
+
+# =========================================================
+# Snapshot round trip
+# =========================================================
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "bank.snap")
+    bank = Bank()
+    checking, savings = _populate(bank)
+
+    write_snapshot(bank, path, wal_offset=1234)
+    restored = Bank()
+    wal_offset = load_snapshot(path, restored)
+
+    assert wal_offset == 1234
+    assert _state(restored) == _state(bank)
+    assert [tx.tx_type for tx in restored.transactions_for(savings.account_id)] == [TX_TRANSFER]
+    assert len(restored.transactions_for(checking.account_id)) == 3
+    assert restored.accounts[savings.account_id].capitalization_periods_per_year == 4
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_snapshot_of_empty_bank(tmp_path):
+    path = str(tmp_path / "bank.snap")
+    write_snapshot(Bank(), path)
+
+    restored = Bank()
+    assert load_snapshot(path, restored) == 0
+    assert restored.accounts == {}
+    assert len(restored.transactions) == 0
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "not-a-snapshot"
+    path.write_bytes(b"x" * 64)
+
+    with pytest.raises(ValueError):
+        load_snapshot(str(path), Bank())
+
+
+# =========================================================
+# Checkpointing with the write-ahead log
+# =========================================================
+
+def test_checkpoint_then_replay_tail(tmp_path):
+    wal_path = str(tmp_path / "bank.wal")
+    snapshot_path = str(tmp_path / "bank.snap")
+
+    bank = DurableBank.open(wal_path, snapshot_path=snapshot_path)
+    checking, savings = _populate(bank)
+    bank.checkpoint()
+    bank.apply_batch([(TX_DEPOSIT, savings.account_id, None, 7)])
+    expected = _state(bank)
+    bank.close()
+
+    recovered = DurableBank.open(wal_path, snapshot_path=snapshot_path)
+
+    assert _state(recovered) == expected
+    recovered.close()
+
+
+def test_automatic_checkpoints(tmp_path):
+    wal_path = str(tmp_path / "bank.wal")
+    snapshot_path = str(tmp_path / "bank.snap")
+
+    bank = DurableBank.open(wal_path, snapshot_path=snapshot_path, checkpoint_every_records=3)
+    _populate(bank)  # 5 records: checkpoint after the 3rd
+    expected = _state(bank)
+    bank.close()
+
+    assert os.path.exists(snapshot_path)
+    restored = Bank()
+    offset = load_snapshot(snapshot_path, restored)
+    assert 0 < offset < os.path.getsize(wal_path)
+    assert len(restored.transactions) == 1
+
+    assert _state(DurableBank.open(wal_path, snapshot_path=snapshot_path)) == expected
+
+
+# =========================================================
+# Fixed-point money
+# =========================================================
+
+def test_fixed_point_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "bank.snap")
+    bank = Bank(minor_units=100)
+    acc = bank.create_account(ACCOUNT_CHECKING, "A", withdrawal_limit=10_000, overdraft_limit=-50)
+    bank.deposit(acc.account_id, 2**53 + 1)
+
+    write_snapshot(bank, path)
+    restored = Bank(minor_units=100)
+    load_snapshot(path, restored)
+
+    assert _state(restored) == _state(bank)
+    assert restored.accounts[acc.account_id].balance == 2**53 + 1
+    assert restored.accounts[acc.account_id].overdraft_limit == -50
+
+    with pytest.raises(ValueError):
+        load_snapshot(path, Bank())
+
+
+def test_snapshot_into_columnar_bank(tmp_path):
+    path = str(tmp_path / "bank.snap")
+    bank = Bank()
+    _populate(bank)
+    write_snapshot(bank, path)
+
+    restored = Bank(columnar_accounts=True)
+    load_snapshot(path, restored)
+
+    assert {i: a.balance for i, a in restored.accounts.items()} == {i: a.balance for i, a in bank.accounts.items()}
+    assert _state(restored)[2] == _state(bank)[2]
+    assert restored.account_store.total_balance() == 470
+
+
+def test_point_in_time_balances_after_load(tmp_path):
+    path = str(tmp_path / "bank.snap")
+    bank = Bank()
+    checking, savings = _populate(bank)
+    write_snapshot(bank, path)
+
+    restored = Bank()
+    load_snapshot(path, restored)
+    restored.deposit(savings.account_id, 1)
+
+    now = datetime.now()
+    assert restored.balance_at(checking.account_id, now) == checking.balance
+    assert restored.balance_at(savings.account_id, now) == savings.balance + 1
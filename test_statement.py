@@ -0,0 +1,82 @@
+import io
+from datetime import datetime
+
+import pytest
+
+from bank import Bank, ACCOUNT_CHECKING, TX_DEPOSIT, TX_TRANSFER, TX_WITHDRAW, AccountNotFoundError
+from config_test import bank
+from statement import render_statement, render_transactions
+
+
+# =========================================================
+# Helpers
+# =========================================================
+
+def _ns(second, microsecond=0):
+    moment = datetime(2024, 3, 1, 9, 30, second, microsecond)
+    return int(moment.replace(microsecond=0).timestamp()) * 10**9 + microsecond * 1_000
+
+
+def _populate(bank):
+    for owner in ("A", "B"):
+        bank.create_account(ACCOUNT_CHECKING, owner, withdrawal_limit=10_000, overdraft_limit=-100)
+    record = bank.transactions.record
+    record(TX_DEPOSIT, 100, 0, timestamp_ns=_ns(1))
+    record(TX_DEPOSIT, 2.5, 1, timestamp_ns=_ns(1, 500))
+    record(TX_TRANSFER, 10, 0, 1, timestamp_ns=_ns(1, 900))
+    record(TX_WITHDRAW, 7.125, 1, timestamp_ns=_ns(2))
+
+
+# =========================================================
+# Rendering
+# =========================================================
+
+def test_rendered_lines_match_transaction_str(bank):
+    _populate(bank)
+    out = io.StringIO()
+
+    assert render_transactions(bank.transactions, out, chunk_rows=3) == 4
+    assert out.getvalue().splitlines() == [str(tx) for tx in bank.transactions]
+
+
+def test_render_transactions_time_range(bank):
+    _populate(bank)
+    out = io.StringIO()
+
+    render_transactions(bank.transactions, out, since=datetime(2024, 3, 1, 9, 30, 1, 600))
+
+    assert out.getvalue().splitlines() == [str(tx) for tx in bank.transactions[2:]]
+
+
+def test_statement_has_account_summary_and_its_postings(bank):
+    _populate(bank)
+    out = io.StringIO()
+
+    lines = render_statement(bank, 1, out)
+
+    text = out.getvalue()
+    assert lines == 3
+    assert text.startswith(str(bank.accounts[1]) + "\n")
+    assert text.splitlines()[-3:] == [str(tx) for tx in bank.transactions_for(1)]
+    assert "TRANSFER | 10.00 | 0 -> 1" in text
+
+
+def test_statement_until_and_missing_account(bank):
+    _populate(bank)
+    out = io.StringIO()
+
+    assert render_statement(bank, 0, out, until=datetime(2024, 3, 1, 9, 30, 1, 900)) == 1
+    with pytest.raises(AccountNotFoundError):
+        render_statement(bank, 9, io.StringIO())
+
+
+def test_fixed_point_statement():
+    bank = Bank(minor_units=1000)
+    acc = bank.create_account(ACCOUNT_CHECKING, "A", withdrawal_limit=10**6, overdraft_limit=0)
+    bank.deposit(acc.account_id, 12_345)
+    out = io.StringIO()
+
+    render_statement(bank, acc.account_id, out)
+
+    assert out.getvalue().splitlines()[-1] == str(bank.transactions[0])
+    assert "DEPOSIT | 12.345 | 0" in out.getvalue()
@@ -0,0 +1,216 @@
+import time
+from datetime import timedelta
+
+import pytest
+
+from bank import (
+    ACCOUNT_CHECKING,
+    ACCOUNT_SAVINGS,
+    TX_DEPOSIT,
+    TX_TRANSFER,
+    InsufficientFundsError,
+)
+from wal import DurableBank
+
+
+# =========================================================
+# Fixtures
+# =========================================================
+
+@pytest.fixture
+def wal_path(tmp_path):
+    return str(tmp_path / "bank.wal")
+
+
+def _populate(bank):
+    checking = bank.create_account(
+        ACCOUNT_CHECKING,
+        "Alice",
+        withdrawal_limit=1_000,
+        overdraft_limit=-100,
+    )
+    savings = bank.create_account(
+        ACCOUNT_SAVINGS,
+        "Żaneta",
+        capitalization_periods_per_year=12,
+        annual_interest_rate=6,
+        withdrawal_limit=500,
+    )
+    bank.deposit(checking.account_id, 500)
+    bank.transfer(checking.account_id, savings.account_id, 200)
+    bank.withdraw(checking.account_id, 50.25)
+    bank.apply_batch([(TX_DEPOSIT, savings.account_id, None, 10), (TX_TRANSFER, savings.account_id, 42, 1)])
+    return checking, savings
+
+
+def _state(bank):
+    return (
+        {i: (type(a).__name__, a.owner, a.balance) for i, a in bank.accounts.items()},
+        [(tx.tx_type, tx.amount, tx.source_account_id, tx.target_account_id, tx.timestamp) for tx in bank.transactions],
+    )
+
+
+# =========================================================
+# Recovery
+# =========================================================
+
+def test_recovery_restores_accounts_and_journal(wal_path):
+    bank = DurableBank.open(wal_path)
+    _populate(bank)
+    expected = _state(bank)
+    bank.close()
+
+    recovered = DurableBank.open(wal_path)
+
+    assert _state(recovered) == expected
+    assert recovered.accounts[1].capitalization_periods_per_year == 12
+    new = recovered.create_account(ACCOUNT_CHECKING, "Bob", withdrawal_limit=1, overdraft_limit=0)
+    assert new.account_id == 2
+    recovered.close()
+
+
+def test_failed_operations_are_not_logged(wal_path):
+    bank = DurableBank.open(wal_path)
+    checking, _ = _populate(bank)
+    with pytest.raises(InsufficientFundsError):
+        bank.withdraw(checking.account_id, 999)
+    expected = _state(bank)
+    bank.close()
+
+    assert _state(DurableBank.open(wal_path)) == expected
+
+
+class _UncomparableAmount:
+    def __le__(self, other):
+        raise RuntimeError("cannot compare")
+
+
+def test_postings_of_a_batch_that_raises_partway_are_logged(wal_path):
+    bank = DurableBank.open(wal_path)
+    checking, _ = _populate(bank)
+    with pytest.raises(RuntimeError):
+        bank.apply_batch([
+            (TX_DEPOSIT, checking.account_id, None, 5),
+            (TX_DEPOSIT, checking.account_id, None, _UncomparableAmount()),
+        ])
+    bank.deposit(checking.account_id, 1)
+    expected = _state(bank)
+    bank.close()
+
+    assert _state(DurableBank.open(wal_path)) == expected
+
+
+def test_log_failure_refuses_further_changes(wal_path, monkeypatch):
+    bank = DurableBank.open(wal_path)
+    checking, _ = _populate(bank)
+    expected = _state(bank)
+
+    def fail(records):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(bank.wal, "append_group", fail)
+    with pytest.raises(OSError):
+        bank.deposit(checking.account_id, 5)
+    monkeypatch.undo()
+
+    # the retry must not post a second time
+    with pytest.raises(OSError, match="reopen"):
+        bank.deposit(checking.account_id, 5)
+    assert checking.balance == expected[0][checking.account_id][2] + 5
+    bank.close()
+
+    assert _state(DurableBank.open(wal_path)) == expected
+
+
+def test_recovery_replays_interest_capitalization(wal_path):
+    bank = DurableBank.open(wal_path)
+    _, savings = _populate(bank)
+    as_of = savings.last_capitalized_at + timedelta(days=365)
+    bank.capitalize_interest(as_of)
+    expected = _state(bank)
+    bank.close()
+
+    recovered = DurableBank.open(wal_path)
+
+    assert _state(recovered) == expected
+    assert recovered.accounts[savings.account_id].last_capitalized_at == savings.last_capitalized_at
+    assert recovered.capitalize_interest(as_of) == 0
+
+
+def test_torn_tail_is_discarded_and_truncated(wal_path):
+    bank = DurableBank.open(wal_path)
+    _populate(bank)
+    expected = _state(bank)
+    bank.close()
+    with open(wal_path, "ab") as f:
+        f.write(b"\x01\x29\x00\x00\x00garbage")
+
+    recovered = DurableBank.open(wal_path)
+    assert _state(recovered) == expected
+    recovered.deposit(0, 1)
+    recovered.close()
+
+    assert len(DurableBank.open(wal_path).transactions) == len(expected[1]) + 1
+
+
+# =========================================================
+# Group commit
+# =========================================================
+
+def test_group_commit_syncs_every_n_records(wal_path):
+    bank = DurableBank.open(wal_path, sync_every_records=4)
+    account = bank.create_account(ACCOUNT_CHECKING, "A", withdrawal_limit=100, overdraft_limit=0)
+    for _ in range(6):
+        bank.deposit(account.account_id, 1)
+
+    assert bank.wal.syncs == 1  # after the 4th record; 3 still pending
+    bank.close()
+    assert bank.wal.syncs == 2
+
+
+def test_bulk_calls_are_synced_once(wal_path):
+    bank = DurableBank.open(wal_path)
+    accounts = bank.create_accounts(
+        (ACCOUNT_CHECKING, f"Owner {i}", {"withdrawal_limit": 100, "overdraft_limit": 0}) for i in range(1_000)
+    )
+    bank.apply_batch([(TX_DEPOSIT, account.account_id, None, 5) for account in accounts])
+
+    assert bank.wal.records == 2_000
+    assert bank.wal.syncs == 2
+    bank.close()
+
+    recovered = DurableBank.open(wal_path)
+    assert len(recovered.accounts) == 1_000
+    assert sum(account.balance for account in recovered.accounts.values()) == 5_000
+
+
+def test_group_commit_interval_flushes_in_background(wal_path):
+    bank = DurableBank.open(wal_path, sync_every_records=1_000, sync_interval_ms=5)
+    bank.create_account(ACCOUNT_CHECKING, "A", withdrawal_limit=100, overdraft_limit=0)
+
+    deadline = time.monotonic() + 5
+    while bank.wal.syncs == 0 and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+    assert bank.wal.syncs >= 1
+    bank.close()
+
+
+# =========================================================
+# Fixed-point money
+# =========================================================
+
+def test_fixed_point_recovery_is_exact(wal_path):
+    bank = DurableBank.open(wal_path, minor_units=100)
+    acc = bank.create_account(ACCOUNT_CHECKING, "A", withdrawal_limit=10**15, overdraft_limit=0)
+    bank.deposit(acc.account_id, 2**53 + 1)
+    bank.withdraw(acc.account_id, 1)
+    bank.close()
+
+    recovered = DurableBank.open(wal_path, minor_units=100)
+
+    restored = recovered.accounts[acc.account_id]
+    assert restored.balance == 2**53
+    assert isinstance(restored.balance, int)
+    assert restored.withdrawal_limit == 10**15 and isinstance(restored.withdrawal_limit, int)
+    assert recovered.transactions[0].amount == 2**53 + 1
@@ -0,0 +1,347 @@
+import os
+import struct
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+
+from bank import (
+    Bank,
+    CheckingAccount,
+    SavingsAccount,
+    TX_TYPES,
+    TX_WITHDRAW,
+    TX_TRANSFER,
+    TX_CODES,
+    NO_ACCOUNT,
+    datetime_to_ns,
+    ns_to_datetime,
+)
+from snapshot import load_snapshot, write_snapshot
+
+# =====================
+# Record layout
+# =====================
+
+# Every record: kind, payload length, CRC32 of payload, payload
+HEADER = struct.Struct("<BII")
+
+REC_POSTING = 1
+REC_CHECKING = 2
+REC_SAVINGS = 3
+REC_CAPITALIZE = 4
+REC_POSTING_EXACT = 5
+
+# type code, amount, source id, target id (NO_ACCOUNT if none), timestamp ns
+POSTING = struct.Struct("<bdqqq")
+# same, with the amount in integer minor units (fixed-point banks)
+POSTING_EXACT = struct.Struct("<bqqqq")
+# account id, withdrawal limit, overdraft limit; owner (utf-8) follows
+CHECKING = struct.Struct("<qdd")
+# account id, periods per year, rate, withdrawal limit, last capitalized ns; owner follows
+SAVINGS = struct.Struct("<qqddq")
+# as-of ns, posted-at ns
+CAPITALIZE = struct.Struct("<qq")
+
+_WITHDRAW = TX_CODES[TX_WITHDRAW]
+_TRANSFER = TX_CODES[TX_TRANSFER]
+
+
+# =====================
+# Write-ahead log
+# =====================
+
+class WriteAheadLog:
+    """
+    Append-only binary log of Bank state changes.
+
+    Records are written to the OS immediately; fsync is grouped: the log is
+    synced once ``sync_every_records`` records are pending and, if
+    ``sync_interval_ms`` is set, by a background thread at that interval.
+    ``sync_every_records=1`` makes every acknowledged operation durable;
+    larger groups trade a bounded loss window for throughput. The records
+    of one call (e.g. all postings of an apply_batch) are written as one
+    group and synced at most once.
+    """
+
+    def __init__(self, path, sync_every_records=1, sync_interval_ms=None):
+        self.path = path
+        self.sync_every_records = sync_every_records
+        self.syncs = 0
+        self.records = 0
+        self._file = open(path, "ab")
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = None
+        if sync_interval_ms:
+            self._flusher = threading.Thread(target=self._flush_periodically, args=(sync_interval_ms / 1000,), daemon=True)
+            self._flusher.start()
+
+    def _flush_periodically(self, interval):
+        while not self._closed.wait(interval):
+            self.sync()
+
+    def _sync_locked(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self.syncs += 1
+
+    def sync(self):
+        with self._lock:
+            if self._pending:
+                self._sync_locked()
+
+    def close(self):
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.sync()
+        self._file.close()
+
+    def tell(self):
+        """Byte offset just past the last appended record."""
+        with self._lock:
+            self._file.flush()
+            return self._file.tell()
+
+    def append(self, kind, payload):
+        self.append_group([(kind, payload)])
+
+    def append_group(self, records):
+        """Write ``(kind, payload)`` records together; the group is synced at most once."""
+        data = b"".join(HEADER.pack(kind, len(payload), zlib.crc32(payload)) + payload for kind, payload in records)
+        if not data:
+            return
+        with self._lock:
+            self._file.write(data)
+            count = len(records)
+            self.records += count
+            self._pending += count
+            if self._pending >= self.sync_every_records:
+                self._sync_locked()
+
+    def log_postings(self, rows, exact=False):
+        kind, layout = (REC_POSTING_EXACT, POSTING_EXACT) if exact else (REC_POSTING, POSTING)
+        self.append_group([(kind, layout.pack(*row)) for row in rows])
+
+    @staticmethod
+    def _account_record(account):
+        owner = account.owner.encode("utf-8")
+        if isinstance(account, SavingsAccount):
+            return REC_SAVINGS, SAVINGS.pack(
+                account.account_id,
+                account.capitalization_periods_per_year,
+                account.annual_interest_rate,
+                account.withdrawal_limit,
+                datetime_to_ns(account.last_capitalized_at),
+            ) + owner
+        return REC_CHECKING, CHECKING.pack(
+            account.account_id,
+            account.withdrawal_limit,
+            account.overdraft_limit,
+        ) + owner
+
+    def log_account(self, account):
+        self.append(*self._account_record(account))
+
+    def log_accounts(self, accounts):
+        self.append_group([self._account_record(account) for account in accounts])
+
+    def log_capitalization(self, as_of, posted_at):
+        self.append(REC_CAPITALIZE, CAPITALIZE.pack(datetime_to_ns(as_of), datetime_to_ns(posted_at)))
+
+    def replay_into(self, bank, start=0):
+        """
+        Apply every intact record from byte offset ``start`` to ``bank``.
+
+        Replay stops at the first torn or corrupt record (e.g. a write cut
+        short by a crash), truncates the log there so new records follow
+        valid data, and returns that offset.
+        """
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            data = f.read()
+
+        end = _replay(bank, data)
+        if end < len(data):
+            with self._lock:
+                self._file.flush()
+                self._file.truncate(start + end)
+        return start + end
+
+
+def _whole(value):
+    if not value.is_integer():
+        raise ValueError("Fractional limit logged for a fixed-point bank")
+    return int(value)
+
+
+def _replay(bank, data):
+    accounts = bank.accounts
+    record = bank.transactions.record
+    # limits are logged as doubles; a fixed-point bank keeps them integral
+    limit = float if bank.minor_units is None else _whole
+    header_size = HEADER.size
+    offset = 0
+
+    while offset + header_size <= len(data):
+        kind, length, crc = HEADER.unpack_from(data, offset)
+        payload = data[offset + header_size:offset + header_size + length]
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            break
+        offset += header_size + length
+
+        if kind == REC_POSTING or kind == REC_POSTING_EXACT:
+            layout = POSTING if kind == REC_POSTING else POSTING_EXACT
+            code, amount, source_id, target_id, timestamp_ns = layout.unpack(payload)
+            if code == _WITHDRAW or code == _TRANSFER:
+                accounts[source_id]._balance -= amount
+            else:
+                accounts[source_id]._balance += amount
+            if code == _TRANSFER:
+                accounts[target_id]._balance += amount
+            record(TX_TYPES[code], amount, source_id, None if target_id == NO_ACCOUNT else target_id, timestamp_ns)
+        elif kind == REC_CHECKING:
+            account_id, withdrawal_limit, overdraft_limit = CHECKING.unpack_from(payload)
+            owner = payload[CHECKING.size:].decode("utf-8")
+            bank._register(CheckingAccount(account_id, owner, limit(withdrawal_limit), limit(overdraft_limit)))
+        elif kind == REC_SAVINGS:
+            account_id, periods, rate, withdrawal_limit, last_capitalized_ns = SAVINGS.unpack_from(payload)
+            owner = payload[SAVINGS.size:].decode("utf-8")
+            bank._register(SavingsAccount(
+                account_id, owner, periods, rate, limit(withdrawal_limit), ns_to_datetime(last_capitalized_ns)
+            ))
+        elif kind == REC_CAPITALIZE:
+            as_of_ns, posted_at_ns = CAPITALIZE.unpack(payload)
+            # Interest is deterministic given the replayed state: recompute it
+            Bank.capitalize_interest(bank, ns_to_datetime(as_of_ns), ns_to_datetime(posted_at_ns))
+        else:
+            break
+
+    return offset
+
+
+# =====================
+# Durable Bank
+# =====================
+
+class DurableBank(Bank):
+    """
+    Bank that logs every state change to a WriteAheadLog before returning.
+
+    Postings are logged even when the call that made them raises partway.
+    If writing the log fails, memory is ahead of the log: the bank then
+    raises OSError on every further change until it is reopened, which
+    recovers the logged state.
+
+    Use ``DurableBank.open(path)`` to recover state from an existing log
+    and keep appending to it. With a ``snapshot_path``, ``checkpoint()``
+    (called automatically every ``checkpoint_every_records`` log records,
+    if set) writes a snapshot, and ``open`` loads the latest snapshot and
+    replays only the log written after it.
+    """
+
+    def __init__(self, wal, snapshot_path=None, checkpoint_every_records=None, minor_units=None,
+                 columnar_accounts=False, idempotency_cache=None):
+        super().__init__(minor_units, columnar_accounts, idempotency_cache)
+        self.wal = wal
+        self.snapshot_path = snapshot_path
+        self.checkpoint_every_records = checkpoint_every_records
+        self._checkpointed_at = wal.records
+        # set when a log write fails; the bank then refuses changes
+        self._log_failure = None
+
+    @classmethod
+    def open(cls, path, snapshot_path=None, checkpoint_every_records=None, minor_units=None,
+             columnar_accounts=False, idempotency_cache=None, **wal_options):
+        wal = WriteAheadLog(path, **wal_options)
+        bank = cls(wal, snapshot_path, checkpoint_every_records, minor_units, columnar_accounts, idempotency_cache)
+        start = 0
+        if snapshot_path is not None and os.path.exists(snapshot_path):
+            start = load_snapshot(snapshot_path, bank)
+        wal.replay_into(bank, start)
+        return bank
+
+    def close(self):
+        self.wal.close()
+
+    def checkpoint(self):
+        """Snapshot the current state, tagged with the current WAL offset."""
+        if self.snapshot_path is None:
+            raise ValueError("No snapshot path configured")
+        self._writable()
+        self.wal.sync()
+        write_snapshot(self, self.snapshot_path, self.wal.tell())
+        self._checkpointed_at = self.wal.records
+
+    def _writable(self):
+        if self._log_failure is not None:
+            raise OSError("Write-ahead log failed; reopen the bank to recover") from self._log_failure
+
+    def _log(self, write, *args):
+        # Memory is already ahead of the log here: if the write fails, the
+        # bank refuses further changes so a retry cannot post twice
+        try:
+            write(*args)
+        except BaseException as e:
+            self._log_failure = e
+            raise
+        every = self.checkpoint_every_records
+        if every and self.wal.records - self._checkpointed_at >= every:
+            self.checkpoint()
+
+    @contextmanager
+    def _logging_postings(self):
+        """Log every posting made inside the block, even if the block raises partway."""
+        self._writable()
+        start = len(self.transactions)
+        try:
+            yield
+        finally:
+            self._log(self.wal.log_postings, self.transactions.iter_rows(start), self.minor_units is not None)
+
+    def create_account(self, account_type, owner, **kwargs):
+        self._writable()
+        account = super().create_account(account_type, owner, **kwargs)
+        self._log(self.wal.log_account, account)
+        return account
+
+    def create_accounts(self, specs):
+        self._writable()
+        accounts = super().create_accounts(specs)
+        self._log(self.wal.log_accounts, accounts)
+        return accounts
+
+    def deposit(self, account_id, amount, idempotency_key=None):
+        with self._logging_postings():
+            super().deposit(account_id, amount, idempotency_key)
+
+    def withdraw(self, account_id, amount, idempotency_key=None):
+        with self._logging_postings():
+            super().withdraw(account_id, amount, idempotency_key)
+
+    def transfer(self, from_id, to_id, amount, idempotency_key=None):
+        with self._logging_postings():
+            super().transfer(from_id, to_id, amount, idempotency_key)
+
+    def apply_batch(self, ops, timestamp_ns=None):
+        with self._logging_postings():
+            return super().apply_batch(ops, timestamp_ns)
+
+    def capitalize_interest(self, as_of=None, posted_at=None):
+        self._writable()
+        as_of = as_of if as_of is not None else datetime.now()
+        posted_at = posted_at if posted_at is not None else datetime.now()
+        start = len(self.transactions)
+        try:
+            credited = super().capitalize_interest(as_of, posted_at)
+        except BaseException as e:
+            if len(self.transactions) != start:
+                # replay recomputes interest from one record: a partial run
+                # cannot be logged, so memory and log have diverged
+                self._log_failure = e
+            raise
+        self._log(self.wal.log_capitalization, as_of, posted_at)
+        return credited